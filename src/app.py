@@ -6,6 +6,7 @@ from pathlib import Path
 
 from PySide6.QtWidgets import QApplication
 
+from .data.db import close_connections
 from .ui.main_window import MainWindow
 from .utils.logging_config import configure_logging
 
@@ -13,6 +14,7 @@ from .utils.logging_config import configure_logging
 def main() -> None:
     configure_logging()
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(close_connections)
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
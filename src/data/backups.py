@@ -1,7 +1,19 @@
-"""Database backup utilities."""
+"""Database backup utilities.
+
+Backups are taken online with the SQLite backup API, verified with
+``PRAGMA integrity_check`` and stored as a JSON manifest pointing at
+compressed, content-addressed chunks. Unchanged chunks are shared between
+backups, so keeping a week of snapshots costs little more than one.
+"""
 from __future__ import annotations
 
+import hashlib
+import json
 import shutil
+import sqlite3
+import tempfile
+import zlib
+from contextlib import closing
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
@@ -10,22 +22,101 @@ from .db import get_db_path
 BACKUP_DIR = Path("backups")
 BACKUP_DIR.mkdir(exist_ok=True)
 RETENTION_DAYS = 7
+PAGES_PER_STEP = 256
+STEP_SLEEP_SECONDS = 0.005
+CHUNK_SIZE = 64 * 1024
 
 
 def create_backup() -> Path:
     src = get_db_path()
     if not src.exists():
         raise FileNotFoundError("Database file does not exist")
-    timestamp = datetime.now(UTC).strftime("%Y%m%d-%H%M%S")
-    dst = BACKUP_DIR / f"betledger-{timestamp}.sqlite"
-    shutil.copy2(src, dst)
+    timestamp = datetime.now(UTC).strftime("%Y%m%d-%H%M%S-%f")
+    manifest_path = BACKUP_DIR / f"betledger-{timestamp}.json"
+    with tempfile.TemporaryDirectory(dir=BACKUP_DIR) as tmp:
+        snapshot = Path(tmp) / "snapshot.sqlite"
+        _snapshot(src, snapshot)
+        _verify(snapshot)
+        manifest = _store_chunks(snapshot)
+    manifest["created_at"] = timestamp
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
     _purge_old_backups()
+    return manifest_path
+
+
+def restore_backup(manifest_path: Path, dst: Path) -> Path:
+    """Rebuild the database file described by ``manifest_path`` at ``dst``."""
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    digest = hashlib.sha256()
+    tmp_dst = dst.with_name(dst.name + ".partial")
+    with tmp_dst.open("wb") as fh:
+        for chunk_hash in manifest["chunks"]:
+            data = zlib.decompress(_chunk_path(chunk_hash).read_bytes())
+            digest.update(data)
+            fh.write(data)
+    if digest.hexdigest() != manifest["sha256"]:
+        tmp_dst.unlink(missing_ok=True)
+        raise ValueError("Backup content does not match its manifest")
+    tmp_dst.replace(dst)
     return dst
 
 
+def _snapshot(src: Path, dst: Path) -> None:
+    # Copy a few pages at a time so writers are only blocked briefly per step.
+    with closing(sqlite3.connect(src)) as source, closing(sqlite3.connect(dst)) as target:
+        source.backup(target, pages=PAGES_PER_STEP, sleep=STEP_SLEEP_SECONDS)
+
+
+def _verify(snapshot: Path) -> None:
+    with closing(sqlite3.connect(snapshot)) as conn:
+        result = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+    if result != ["ok"]:
+        raise sqlite3.DatabaseError(f"Backup failed integrity check: {'; '.join(result)}")
+
+
+def _store_chunks(snapshot: Path) -> dict:
+    chunks: list[str] = []
+    digest = hashlib.sha256()
+    size = 0
+    with snapshot.open("rb") as fh:
+        while data := fh.read(CHUNK_SIZE):
+            digest.update(data)
+            size += len(data)
+            chunk_hash = hashlib.sha256(data).hexdigest()
+            path = _chunk_path(chunk_hash)
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".tmp")
+                tmp_path.write_bytes(zlib.compress(data, 6))
+                tmp_path.replace(path)
+            chunks.append(chunk_hash)
+    return {"size": size, "sha256": digest.hexdigest(), "chunk_size": CHUNK_SIZE, "chunks": chunks}
+
+
+def _chunk_dir() -> Path:
+    return BACKUP_DIR / "chunks"
+
+
+def _chunk_path(chunk_hash: str) -> Path:
+    return _chunk_dir() / chunk_hash[:2] / f"{chunk_hash}.z"
+
+
 def _purge_old_backups() -> None:
     cutoff = datetime.now(UTC) - timedelta(days=RETENTION_DAYS)
-    for file in BACKUP_DIR.glob("betledger-*.sqlite"):
+    for file in [*BACKUP_DIR.glob("betledger-*.json"), *BACKUP_DIR.glob("betledger-*.sqlite")]:
         mtime = datetime.fromtimestamp(file.stat().st_mtime, UTC)
         if mtime < cutoff:
             file.unlink(missing_ok=True)
+
+    referenced: set[str] = set()
+    for manifest in BACKUP_DIR.glob("betledger-*.json"):
+        referenced.update(json.loads(manifest.read_text(encoding="utf-8"))["chunks"])
+    chunk_dir = _chunk_dir()
+    if not chunk_dir.exists():
+        return
+    for chunk in chunk_dir.glob("*/*.z"):
+        if chunk.stem not in referenced:
+            chunk.unlink(missing_ok=True)
+    for bucket in chunk_dir.iterdir():
+        if bucket.is_dir() and not any(bucket.iterdir()):
+            shutil.rmtree(bucket, ignore_errors=True)
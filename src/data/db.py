@@ -1,15 +1,18 @@
 """SQLite database helpers and schema management."""
 from __future__ import annotations
 
+import logging
 import sqlite3
+import threading
 from contextlib import contextmanager
+from functools import lru_cache
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Iterator
+from typing import Any, Callable, Iterator, Sequence
 
-SCHEMA = """
-PRAGMA foreign_keys=ON;
+logger = logging.getLogger(__name__)
 
+SCHEMA = """
 CREATE TABLE IF NOT EXISTS accounts (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     name TEXT NOT NULL,
@@ -82,6 +85,166 @@ CREATE INDEX IF NOT EXISTS idx_ops_account_ts ON operations(origin_account_id, t
 CREATE INDEX IF NOT EXISTS idx_tx_account_ts ON transactions(account_id, ts);
 """
 
+# Regenerates the daily rollups (created by migration 5) from raw history; run
+# inside one transaction.
+ROLLUP_REBUILD = [
+    "DELETE FROM rollup_tx_daily",
+    "DELETE FROM rollup_ops_daily",
+    """
+    INSERT INTO rollup_tx_daily (day, account_id, kind, amount_sum, tx_count)
+    SELECT date(ts), account_id, kind, SUM(amount), COUNT(*)
+    FROM transactions
+    GROUP BY 1, 2, 3
+    """,
+    """
+    INSERT INTO rollup_ops_daily (day, mode, status, op_count, stake_sum)
+    SELECT date(ts), mode, status, COUNT(*), SUM(stake_a)
+    FROM operations
+    GROUP BY 1, 2, 3
+    """,
+]
+
+# Numbered schema migrations tracked through ``PRAGMA user_version``. Append new
+# entries at the end; never edit one that has already shipped. Scripts are
+# written out in full so that changing a shared constant cannot rewrite them.
+MIGRATIONS: list[tuple[int, str]] = [
+    (1, SCHEMA),
+    (
+        2,
+        """
+        CREATE TABLE IF NOT EXISTS balance_checkpoints (
+            account_id INTEGER PRIMARY KEY REFERENCES accounts(id),
+            last_tx_id INTEGER NOT NULL,
+            balance REAL NOT NULL,
+            bonus_balance REAL NOT NULL,
+            verified_at DATETIME NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_tx_account_id ON transactions(account_id, id);
+        """,
+    ),
+    (
+        3,
+        """
+        CREATE INDEX IF NOT EXISTS idx_ops_ts ON operations(ts);
+        CREATE INDEX IF NOT EXISTS idx_ops_hedge_ts ON operations(hedge_account_id, ts);
+        CREATE INDEX IF NOT EXISTS idx_ops_mode_ts ON operations(mode, ts);
+        CREATE INDEX IF NOT EXISTS idx_ops_event_ts ON operations(event, ts);
+        """,
+    ),
+    (
+        4,
+        """
+        CREATE INDEX IF NOT EXISTS idx_tx_settlements ON transactions(
+            kind, ref_operation_id, account_id, amount
+        ) WHERE kind = 'op_settlement';
+        """,
+    ),
+    # Daily rollups kept current by triggers so dashboards read a handful of
+    # rows instead of scanning ``transactions`` and ``operations``. Transaction
+    # rollups only use columns of the transaction itself, so editing an
+    # operation cannot leave them stale.
+    (
+        5,
+        """
+        CREATE TABLE IF NOT EXISTS rollup_tx_daily (
+            day TEXT NOT NULL,
+            account_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            amount_sum REAL NOT NULL DEFAULT 0,
+            tx_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, account_id, kind)
+        ) WITHOUT ROWID;
+
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_tx_insert AFTER INSERT ON transactions BEGIN
+            INSERT INTO rollup_tx_daily (day, account_id, kind, amount_sum, tx_count)
+            VALUES (date(NEW.ts), NEW.account_id, NEW.kind, NEW.amount, 1)
+            ON CONFLICT(day, account_id, kind) DO UPDATE SET
+                amount_sum = amount_sum + excluded.amount_sum,
+                tx_count = tx_count + 1;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_tx_delete AFTER DELETE ON transactions BEGIN
+            UPDATE rollup_tx_daily SET amount_sum = amount_sum - OLD.amount, tx_count = tx_count - 1
+            WHERE day = date(OLD.ts) AND account_id = OLD.account_id AND kind = OLD.kind;
+            DELETE FROM rollup_tx_daily WHERE tx_count <= 0;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_tx_update AFTER UPDATE OF ts, account_id, kind, amount ON transactions BEGIN
+            UPDATE rollup_tx_daily SET amount_sum = amount_sum - OLD.amount, tx_count = tx_count - 1
+            WHERE day = date(OLD.ts) AND account_id = OLD.account_id AND kind = OLD.kind;
+            INSERT INTO rollup_tx_daily (day, account_id, kind, amount_sum, tx_count)
+            VALUES (date(NEW.ts), NEW.account_id, NEW.kind, NEW.amount, 1)
+            ON CONFLICT(day, account_id, kind) DO UPDATE SET
+                amount_sum = amount_sum + excluded.amount_sum,
+                tx_count = tx_count + 1;
+            DELETE FROM rollup_tx_daily WHERE tx_count <= 0;
+        END;
+
+        CREATE TABLE IF NOT EXISTS rollup_ops_daily (
+            day TEXT NOT NULL,
+            mode TEXT NOT NULL,
+            status TEXT NOT NULL,
+            op_count INTEGER NOT NULL DEFAULT 0,
+            stake_sum REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, mode, status)
+        ) WITHOUT ROWID;
+
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_ops_insert AFTER INSERT ON operations BEGIN
+            INSERT INTO rollup_ops_daily (day, mode, status, op_count, stake_sum)
+            VALUES (date(NEW.ts), NEW.mode, NEW.status, 1, NEW.stake_a)
+            ON CONFLICT(day, mode, status) DO UPDATE SET
+                op_count = op_count + 1,
+                stake_sum = stake_sum + excluded.stake_sum;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_ops_delete AFTER DELETE ON operations BEGIN
+            UPDATE rollup_ops_daily SET op_count = op_count - 1, stake_sum = stake_sum - OLD.stake_a
+            WHERE day = date(OLD.ts) AND mode = OLD.mode AND status = OLD.status;
+            DELETE FROM rollup_ops_daily WHERE op_count <= 0;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_ops_update AFTER UPDATE OF ts, mode, status, stake_a ON operations BEGIN
+            UPDATE rollup_ops_daily SET op_count = op_count - 1, stake_sum = stake_sum - OLD.stake_a
+            WHERE day = date(OLD.ts) AND mode = OLD.mode AND status = OLD.status;
+            INSERT INTO rollup_ops_daily (day, mode, status, op_count, stake_sum)
+            VALUES (date(NEW.ts), NEW.mode, NEW.status, 1, NEW.stake_a)
+            ON CONFLICT(day, mode, status) DO UPDATE SET
+                op_count = op_count + 1,
+                stake_sum = stake_sum + excluded.stake_sum;
+            DELETE FROM rollup_ops_daily WHERE op_count <= 0;
+        END;
+
+        INSERT INTO rollup_tx_daily (day, account_id, kind, amount_sum, tx_count)
+        SELECT date(ts), account_id, kind, SUM(amount), COUNT(*)
+        FROM transactions
+        GROUP BY 1, 2, 3;
+
+        INSERT INTO rollup_ops_daily (day, mode, status, op_count, stake_sum)
+        SELECT date(ts), mode, status, COUNT(*), SUM(stake_a)
+        FROM operations
+        GROUP BY 1, 2, 3;
+        """,
+    ),
+    (
+        6,
+        """
+        CREATE INDEX IF NOT EXISTS idx_ops_pending ON operations(
+            event, origin_account_id, hedge_account_id, stake_source,
+            stake_a, exposure_b, profit_a_wins, profit_b_wins, status
+        ) WHERE status = 'PENDIENTE';
+        """,
+    ),
+    (
+        7,
+        """
+        CREATE INDEX IF NOT EXISTS idx_ops_event_id ON operations(event, id);
+        CREATE INDEX IF NOT EXISTS idx_ops_stake_a_id ON operations(stake_a, id);
+        CREATE INDEX IF NOT EXISTS idx_ops_hedge_stake_b_id ON operations(hedge_stake_b, id);
+        CREATE INDEX IF NOT EXISTS idx_ops_status_id ON operations(status, id);
+        """,
+    ),
+]
+
 
 def get_db_path() -> Path:
     data_dir = Path("data")
@@ -89,23 +252,196 @@ def get_db_path() -> Path:
     return data_dir / "betledger.sqlite"
 
 
+_initialised: set[str] = set()
+_initialise_lock = threading.Lock()
+
+
 def initialise_database() -> None:
+    """Bring the database up to date, at most once per process and file."""
     path = get_db_path()
-    with sqlite3.connect(path) as conn:
-        conn.executescript(SCHEMA)
+    key = str(path)
+    if key in _initialised:
+        return
+    with _initialise_lock:
+        if key in _initialised:
+            return
+        # A dedicated connection: executescript would commit whatever a pooled
+        # connection borrowed further up the stack has pending.
+        conn = sqlite3.connect(path)
+        try:
+            migrate(conn)
+        finally:
+            conn.close()
+        _initialised.add(key)
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply pending migrations, each in its own transaction, and return the version.
+
+    ``conn`` must not be inside a transaction: ``executescript`` would commit it.
+    """
+    if conn.in_transaction:
+        raise RuntimeError("Cannot migrate a connection with an open transaction")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, script in MIGRATIONS:
+        if number <= version:
+            continue
+        try:
+            conn.executescript(f"BEGIN IMMEDIATE;\n{script}\nPRAGMA user_version={number};\nCOMMIT;")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        version = number
+    return version
+
+
+CACHE_SIZE_KIB = 16 * 1024
+MMAP_SIZE = 256 * 1024 * 1024
+
+
+class _Slot:
+    __slots__ = ("conn", "depth", "on_commit")
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        self.depth = 0
+        self.on_commit: list[Callable[[], None]] = []
+
+
+class ConnectionManager:
+    """Hand out one long-lived connection per thread and database file.
+
+    Connections are configured once (WAL journal, ``synchronous=NORMAL``, page
+    cache, memory map and foreign keys) and then reused.  Nested borrows on the
+    same thread share the connection; only the outermost borrow commits, or
+    rolls back if an exception escapes. Callbacks registered with
+    :meth:`after_commit` run once that commit succeeds; one that raises is
+    logged and the rest still run.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: list[sqlite3.Connection] = []
+
+    def _slots(self) -> dict[str, _Slot]:
+        slots = getattr(self._local, "slots", None)
+        if slots is None:
+            slots = self._local.slots = {}
+        return slots
+
+    def _open(self, db_path: Path) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            db_path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        conn.execute("PRAGMA foreign_keys=ON")
+        with self._lock:
+            self._all.append(conn)
+        return conn
+
+    @contextmanager
+    def connection(self, path: Path | None = None) -> Iterator[sqlite3.Connection]:
+        db_path = Path(path or get_db_path())
+        slots = self._slots()
+        key = str(db_path)
+        slot = slots.get(key)
+        if slot is None:
+            slot = slots[key] = _Slot(self._open(db_path))
+        slot.depth += 1
+        try:
+            yield slot.conn
+        except BaseException:
+            slot.depth -= 1
+            if slot.depth == 0:
+                slot.on_commit.clear()
+                slot.conn.rollback()
+            raise
+        slot.depth -= 1
+        if slot.depth == 0:
+            slot.conn.commit()
+            callbacks, slot.on_commit = slot.on_commit, []
+            for callback in callbacks:
+                # The data is committed; one failing listener must not skip the rest.
+                try:
+                    callback()
+                except Exception:
+                    logger.exception("after-commit callback failed")
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run ``callback`` once the current borrow commits, or now if none is open.
+
+        Callbacks queued inside a block that rolls back are dropped.
+        """
+        for slot in self._slots().values():
+            if slot.depth > 0:
+                slot.on_commit.append(callback)
+                return
+        callback()
+
+    @contextmanager
+    def transaction(self, path: Path | None = None) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection inside a single ``BEGIN IMMEDIATE`` transaction.
+
+        Every read and write made on this thread while the block is open, by
+        any service, joins the same transaction and is committed atomically.
+        """
+        with self.connection(path) as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            yield conn
+
+    def close_all(self) -> None:
+        """Close every pooled connection, e.g. on shutdown or between tests."""
+        with self._lock:
+            connections, self._all = self._all, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+_manager = ConnectionManager()
 
 
 @contextmanager
 def get_connection(path: Path | None = None) -> Iterator[sqlite3.Connection]:
-    db_path = path or get_db_path()
-    conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
-    conn.row_factory = sqlite3.Row
-    try:
+    with _manager.connection(path) as conn:
         yield conn
-        conn.commit()
-    finally:
-        conn.close()
+
+
+@contextmanager
+def transaction(path: Path | None = None) -> Iterator[sqlite3.Connection]:
+    with _manager.transaction(path) as conn:
+        yield conn
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    _manager.after_commit(callback)
+
+
+def close_connections() -> None:
+    _manager.close_all()
 
 
 def now_ts() -> str:
     return datetime.now(UTC).isoformat(timespec="seconds")
+
+
+@lru_cache(maxsize=65536)
+def parse_ts(value: str | None) -> datetime | None:
+    """Parse a stored ISO timestamp; repeated values are decoded only once."""
+    return datetime.fromisoformat(value) if value else None
+
+
+def fetch_tuples(conn: sqlite3.Connection, query: str, params: Sequence[Any] = ()) -> list[tuple]:
+    """Run ``query`` returning plain tuples instead of ``sqlite3.Row`` objects."""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor.execute(query, params).fetchall()
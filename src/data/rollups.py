@@ -0,0 +1,16 @@
+"""Rebuild the dashboard rollup tables from raw history."""
+from __future__ import annotations
+
+from .db import ROLLUP_REBUILD, initialise_database, transaction
+
+
+def rebuild_rollups() -> None:
+    initialise_database()
+    with transaction() as conn:
+        for statement in ROLLUP_REBUILD:
+            conn.execute(statement)
+
+
+if __name__ == "__main__":
+    rebuild_rollups()
+    print("Rollup tables rebuilt from transaction history")
@@ -12,6 +12,7 @@ def run() -> None:
         conn.execute("DELETE FROM transactions")
         conn.execute("DELETE FROM operations")
         conn.execute("DELETE FROM incentives")
+        conn.execute("DELETE FROM balance_checkpoints")
         conn.execute("DELETE FROM accounts")
 
         accounts = [
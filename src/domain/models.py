@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Account:
     id: Optional[int]
     name: str
@@ -21,7 +21,7 @@ class Account:
     updated_at: datetime | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     id: Optional[int]
     account_id: int
@@ -34,7 +34,7 @@ class Transaction:
     note: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Operation:
     id: Optional[int]
     ts: datetime
@@ -61,7 +61,7 @@ class Operation:
     notes: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Incentive:
     id: Optional[int]
     account_id: int
@@ -74,7 +74,7 @@ class Incentive:
     notes: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Opportunity:
     provider_a: str
     provider_b: str
@@ -1,22 +1,77 @@
 """Service layer for account and transaction management."""
 from __future__ import annotations
 
-from dataclasses import asdict
+from dataclasses import asdict, dataclass, field, fields
 from datetime import datetime
 from typing import List
 
 from ..domain.models import Account, Transaction
-from ..data.db import get_connection, initialise_database, now_ts
+from ..data.db import after_commit, fetch_tuples, get_connection, initialise_database, now_ts, parse_ts, transaction
+from ..utils.events import TRANSACTION_APPLIED, EventBus, get_global_bus
+
+# Columns selected in ``Account`` field order so rows decode positionally.
+ACCOUNT_COLUMNS = tuple(f.name for f in fields(Account))
+_ACCOUNT_SELECT = f"SELECT {', '.join(ACCOUNT_COLUMNS)} FROM accounts"
+
+# Driven from ``accounts`` so each account seeks ``idx_tx_account_id`` past its
+# checkpoint; only transactions recorded since the last check are read.
+_RECONCILE_ALL = """
+    SELECT
+        a.id,
+        a.name,
+        a.balance,
+        a.bonus_balance,
+        COALESCE(cp.balance, 0) + COALESCE(SUM(CASE WHEN tx.kind='incentive' THEN 0 ELSE tx.amount END), 0),
+        COALESCE(cp.bonus_balance, 0) + COALESCE(SUM(CASE WHEN tx.kind='incentive' THEN tx.amount ELSE 0 END), 0),
+        COALESCE(MAX(tx.id), cp.last_tx_id, 0)
+    FROM accounts a
+    LEFT JOIN balance_checkpoints cp ON cp.account_id = a.id AND NOT :deep
+    LEFT JOIN transactions tx ON tx.account_id = a.id AND tx.id > COALESCE(cp.last_tx_id, 0)
+    GROUP BY a.id
+    ORDER BY a.id
+"""
+
+
+@dataclass
+class BalanceDiscrepancy:
+    account_id: int
+    name: str
+    stored_balance: float
+    expected_balance: float
+    stored_bonus: float
+    expected_bonus: float
+
+    @property
+    def balance_drift(self) -> float:
+        return self.stored_balance - self.expected_balance
+
+    @property
+    def bonus_drift(self) -> float:
+        return self.stored_bonus - self.expected_bonus
+
+
+@dataclass
+class ReconciliationReport:
+    checked: int
+    discrepancies: List[BalanceDiscrepancy] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.discrepancies
+
+    def __bool__(self) -> bool:
+        return self.ok
 
 
 class AccountService:
-    def __init__(self) -> None:
+    def __init__(self, bus: EventBus | None = None) -> None:
         initialise_database()
+        self.bus = bus or get_global_bus()
 
     def list_accounts(self) -> List[Account]:
         with get_connection() as conn:
-            rows = conn.execute("SELECT * FROM accounts ORDER BY id").fetchall()
-            return [self._row_to_account(row) for row in rows]
+            rows = fetch_tuples(conn, f"{_ACCOUNT_SELECT} ORDER BY id")
+        return [self._row_to_account(row) for row in rows]
 
     def create_account(self, account: Account) -> Account:
         payload = asdict(account)
@@ -68,7 +123,7 @@ class AccountService:
         ts: datetime | None = None,
     ) -> Transaction:
         ts_value = ts.isoformat(timespec="seconds") if ts else now_ts()
-        with get_connection() as conn:
+        with transaction() as conn:
             current_balance, current_bonus = self._current_balances(conn, account_id)
             if kind == "incentive":
                 balance_delta = 0.0
@@ -89,7 +144,7 @@ class AccountService:
                 "UPDATE accounts SET balance=?, bonus_balance=?, updated_at=? WHERE id=?",
                 (new_balance, new_bonus, now_ts(), account_id),
             )
-            return Transaction(
+            applied = Transaction(
                 id=cursor.lastrowid,
                 account_id=account_id,
                 ts=datetime.fromisoformat(ts_value),
@@ -100,6 +155,8 @@ class AccountService:
                 ref_incentive_id=ref_incentive_id,
                 note=note,
             )
+            after_commit(lambda: self.bus.publish(TRANSACTION_APPLIED, applied))
+        return applied
 
     def _current_balances(self, conn, account_id: int) -> tuple[float, float]:
         row = conn.execute(
@@ -116,47 +173,93 @@ class AccountService:
         deficit = required - balance
         return max(deficit, 0.0)
 
-    def reconcile_account(self, account_id: int) -> bool:
-        with get_connection() as conn:
-            tx_sum = conn.execute(
-                """
-                SELECT COALESCE(
-                    SUM(CASE WHEN kind='incentive' THEN 0 ELSE amount END),
-                    0
-                )
-                FROM transactions WHERE account_id=?
-                """,
-                (account_id,)
-            ).fetchone()[0]
-            bonus_sum = conn.execute(
-                "SELECT COALESCE(SUM(amount),0) FROM transactions WHERE account_id=? AND kind='incentive'",
-                (account_id,)
-            ).fetchone()[0]
-            initial_balance = conn.execute(
+    def reconcile_account(self, account_id: int, *, deep: bool = False) -> bool:
+        """Check the stored balances of an account against its transactions.
+
+        Only transactions recorded after the last verified checkpoint are
+        summed; ``deep=True`` ignores the checkpoint and re-verifies the whole
+        history. A successful check advances the checkpoint.
+        """
+        with transaction() as conn:
+            stored = conn.execute(
                 "SELECT balance, bonus_balance FROM accounts WHERE id=?",
                 (account_id,),
             ).fetchone()
-            stored_balance = float(initial_balance[0])
-            stored_bonus = float(initial_balance[1])
-            # Recalculate from zero: assume zero + tx = final, compare to stored
-            recalculated = float(tx_sum)
-            recalculated_bonus = float(bonus_sum)
-        return abs(stored_balance - recalculated) < 1e-6 and abs(stored_bonus - recalculated_bonus) < 1e-6
-
-    def reconcile_all(self) -> bool:
-        return all(self.reconcile_account(acc.id) for acc in self.list_accounts())
-
-    def _row_to_account(self, row) -> Account:
-        return Account(
-            id=row["id"],
-            name=row["name"],
-            owner=row["owner"],
-            type=row["type"],
-            currency=row["currency"],
-            commission=row["commission"],
-            balance=row["balance"],
-            bonus_balance=row["bonus_balance"],
-            notes=row["notes"],
-            created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else None,
-            updated_at=datetime.fromisoformat(row["updated_at"]) if row["updated_at"] else None,
+            if stored is None:
+                raise ValueError("Account not found")
+            checkpoint = None
+            if not deep:
+                checkpoint = conn.execute(
+                    "SELECT last_tx_id, balance, bonus_balance FROM balance_checkpoints WHERE account_id=?",
+                    (account_id,),
+                ).fetchone()
+            # Without a checkpoint, recalculate from zero: zero + tx = final
+            last_tx_id, base_balance, base_bonus = checkpoint or (0, 0.0, 0.0)
+            tx_sum, bonus_sum, max_tx_id = conn.execute(
+                """
+                SELECT
+                    COALESCE(SUM(CASE WHEN kind='incentive' THEN 0 ELSE amount END), 0),
+                    COALESCE(SUM(CASE WHEN kind='incentive' THEN amount ELSE 0 END), 0),
+                    MAX(id)
+                FROM transactions WHERE account_id=? AND id>?
+                """,
+                (account_id, last_tx_id),
+            ).fetchone()
+            stored_balance = float(stored[0])
+            stored_bonus = float(stored[1])
+            recalculated = float(base_balance) + float(tx_sum)
+            recalculated_bonus = float(base_bonus) + float(bonus_sum)
+            matches = abs(stored_balance - recalculated) < 1e-6 and abs(stored_bonus - recalculated_bonus) < 1e-6
+            if matches and (max_tx_id is not None or checkpoint is None):
+                self._save_checkpoint(conn, account_id, max_tx_id or last_tx_id, stored_balance, stored_bonus)
+        return matches
+
+    def _save_checkpoint(self, conn, account_id: int, last_tx_id: int, balance: float, bonus_balance: float) -> None:
+        conn.execute(
+            """
+            INSERT INTO balance_checkpoints (account_id, last_tx_id, balance, bonus_balance, verified_at)
+            VALUES (?,?,?,?,?)
+            ON CONFLICT(account_id) DO UPDATE SET
+                last_tx_id=excluded.last_tx_id,
+                balance=excluded.balance,
+                bonus_balance=excluded.bonus_balance,
+                verified_at=excluded.verified_at
+            """,
+            (account_id, last_tx_id, balance, bonus_balance, now_ts()),
         )
+
+    def reconcile_all(self, *, deep: bool = False) -> ReconciliationReport:
+        """Reconcile every account with one aggregate query over ``transactions``.
+
+        Works like :meth:`reconcile_account` for all accounts at once and
+        returns a report listing the accounts whose stored balances drifted.
+        """
+        with transaction() as conn:
+            rows = conn.execute(
+                _RECONCILE_ALL,
+                {"deep": deep},
+            ).fetchall()
+
+            report = ReconciliationReport(checked=len(rows))
+            verified = []
+            for account_id, name, balance, bonus, expected, expected_bonus, last_tx_id in rows:
+                entry = BalanceDiscrepancy(
+                    account_id=account_id,
+                    name=name,
+                    stored_balance=float(balance),
+                    expected_balance=float(expected),
+                    stored_bonus=float(bonus),
+                    expected_bonus=float(expected_bonus),
+                )
+                if abs(entry.balance_drift) < 1e-6 and abs(entry.bonus_drift) < 1e-6:
+                    verified.append((account_id, last_tx_id, entry.stored_balance, entry.stored_bonus))
+                else:
+                    report.discrepancies.append(entry)
+            for account_id, last_tx_id, balance, bonus in verified:
+                self._save_checkpoint(conn, account_id, last_tx_id, balance, bonus)
+        return report
+
+    @staticmethod
+    def _row_to_account(row: tuple) -> Account:
+        *values, created_at, updated_at = row
+        return Account(*values, parse_ts(created_at), parse_ts(updated_at))
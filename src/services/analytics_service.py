@@ -0,0 +1,154 @@
+"""Vectorised performance analytics over settled operations."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from ..data.db import get_connection, initialise_database
+
+DIMENSIONS = ("account", "owner", "mode", "stake_source")
+
+# Served entirely from the partial index idx_tx_settlements.
+_SETTLEMENTS = """
+    SELECT account_id, ref_operation_id, amount
+    FROM transactions
+    WHERE kind = 'op_settlement'
+"""
+
+
+@dataclass(slots=True)
+class Drawdown:
+    amount: float
+    peak: pd.Timestamp | None = None
+    trough: pd.Timestamp | None = None
+
+
+class AnalyticsService:
+    def __init__(self) -> None:
+        initialise_database()
+
+    def load(self) -> PerformanceAnalytics:
+        """Read settled operations and settlement transactions, one query each."""
+        with get_connection() as conn:
+            operations = pd.read_sql_query(
+                """
+                SELECT id, CAST(strftime('%s', settled_at) AS INTEGER) AS settled_at,
+                       origin_account_id, hedge_account_id, mode, stake_source, stake_a, exposure_b, profit_a_wins, profit_b_wins, status
+                FROM operations
+                WHERE status IN ('GANA_A', 'GANA_B', 'ANULADA')
+                ORDER BY settled_at, id
+                """,
+                conn,
+                index_col="id",
+            )
+            settlements = pd.read_sql_query(_SETTLEMENTS, conn)
+            accounts = pd.read_sql_query("SELECT id, owner FROM accounts", conn, index_col="id")
+        return PerformanceAnalytics(operations, settlements, accounts)
+
+
+class PerformanceAnalytics:
+    """Columnar view of settled history with vectorised performance metrics.
+
+    An operation's capital is the cash it locked: ``stake_a`` when paid in cash
+    plus the hedge ``exposure_b``. ROI is realised profit over that capital.
+    """
+
+    def __init__(self, operations: pd.DataFrame, settlements: pd.DataFrame, accounts: pd.DataFrame) -> None:
+        """``operations`` must be indexed by id, ordered by ``settled_at`` in epoch seconds."""
+        self.accounts = accounts
+        self.settlements = settlements
+        operations = operations.copy()
+        operations["settled_at"] = pd.to_datetime(operations["settled_at"], unit="s", utc=True)
+        origin_capital = np.where(operations["stake_source"].to_numpy() == "efectivo", operations["stake_a"], 0.0)
+        operations["origin_capital"] = origin_capital
+        operations["capital"] = origin_capital + operations["exposure_b"].to_numpy()
+        realised = settlements.groupby("ref_operation_id")["amount"].sum()
+        operations["realised"] = realised.reindex(operations.index, fill_value=0.0).to_numpy()
+        self.operations = operations
+
+    def profit_by(self, dimension: str) -> pd.DataFrame:
+        """Operations, realised profit, capital and ROI per account, owner, mode or stake source."""
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension {dimension!r}")
+        if dimension in ("mode", "stake_source"):
+            grouped = self.operations.groupby(dimension).agg(
+                operations=("realised", "size"),
+                profit=("realised", "sum"),
+                capital=("capital", "sum"),
+            )
+        else:
+            grouped = self._per_account()
+            if dimension == "owner":
+                owners = self.accounts["owner"].reindex(grouped.index)
+                grouped = grouped.groupby(owners.to_numpy()).sum()
+                grouped.index.name = "owner"
+        grouped["roi"] = _safe_ratio(grouped["profit"], grouped["capital"])
+        return grouped
+
+    def rolling_roi(self, window: int = 50) -> pd.Series:
+        """ROI over the last ``window`` settled operations, indexed by settlement time."""
+        if window <= 0:
+            raise ValueError("window must be positive")
+        ops = self.operations.set_index("settled_at")
+        profit = ops["realised"].rolling(window, min_periods=1).sum()
+        capital = ops["capital"].rolling(window, min_periods=1).sum()
+        return _safe_ratio(profit, capital).rename("rolling_roi")
+
+    def max_drawdown(self) -> Drawdown:
+        """Largest fall of cumulative realised profit from a previous peak."""
+        if self.operations.empty:
+            return Drawdown(0.0)
+        cumulative = self.operations["realised"].cumsum().to_numpy()
+        # Start the curve at zero so losses from the very first operation count.
+        running_peak = np.maximum.accumulate(np.concatenate(([0.0], cumulative)))[1:]
+        drawdowns = running_peak - cumulative
+        trough = int(np.argmax(drawdowns))
+        amount = float(drawdowns[trough])
+        if amount <= 0:
+            return Drawdown(0.0)
+        times = self.operations["settled_at"]
+        peak_candidates = np.flatnonzero(cumulative[: trough + 1] == running_peak[trough])
+        peak = times.iloc[peak_candidates[0]] if len(peak_candidates) else None
+        return Drawdown(amount, peak, times.iloc[trough])
+
+    def realised_vs_expected(self) -> pd.DataFrame:
+        """Per-operation settled profit against the calculator's expectation for the outcome."""
+        status = self.operations["status"].to_numpy()
+        expected = np.select(
+            [status == "GANA_A", status == "GANA_B"],
+            [self.operations["profit_a_wins"].to_numpy(), self.operations["profit_b_wins"].to_numpy()],
+            default=0.0,
+        )
+        result = self.operations[["settled_at", "mode", "stake_source", "status", "realised"]].copy()
+        result["expected"] = expected
+        result["difference"] = result["realised"] - expected
+        return result
+
+    def _per_account(self) -> pd.DataFrame:
+        ops = self.operations
+        profit = self.settlements.groupby("account_id")["amount"].sum()
+        capital = pd.concat(
+            [
+                pd.Series(ops["origin_capital"].to_numpy(), index=ops["origin_account_id"].to_numpy()),
+                pd.Series(ops["exposure_b"].to_numpy(), index=ops["hedge_account_id"].to_numpy()),
+            ]
+        )
+        counts = pd.concat(
+            [ops["origin_account_id"], ops["hedge_account_id"]], ignore_index=True
+        ).value_counts()
+        grouped = pd.DataFrame(
+            {
+                "operations": counts,
+                "profit": profit,
+                "capital": capital.groupby(level=0).sum(),
+            }
+        ).fillna(0.0)
+        grouped["operations"] = grouped["operations"].astype(int)
+        grouped.index.name = "account_id"
+        return grouped
+
+
+def _safe_ratio(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    return numerator / denominator.where(denominator != 0)
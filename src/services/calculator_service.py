@@ -1,14 +1,26 @@
 """Calculator service implementing hedge computations."""
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from decimal import Decimal
+from typing import Callable, Hashable
 
+import numpy as np
+
+from ..utils.money import ceil_div, half_up_div, scaled
 from ..utils.rounding import as_float, round_half_up, round_up, to_decimal
-from ..utils.validators import ensure_commission_range, ensure_odds_valid, ensure_positive
+from ..utils.ticks import get_ladder
+from ..utils.validators import (
+    ensure_commission_range,
+    ensure_odds_valid,
+    ensure_positive,
+    validate_and_round_to_tick,
+)
 
 
-@dataclass
+@dataclass(frozen=True)
 class CalculatorResult:
     hedge_stake_b: float
     exposure_b: float
@@ -20,7 +32,131 @@ class CalculatorResult:
     rating: float | None = None
 
 
+@dataclass
+class CalculatorBatchResult:
+    """Column arrays of :class:`CalculatorResult`; fields not used by the mode are ``None``."""
+
+    hedge_stake_b: np.ndarray
+    exposure_b: np.ndarray
+    profit_a_wins: np.ndarray
+    profit_b_wins: np.ndarray
+    perdida_calificacion: np.ndarray | None
+    beneficio_cnr: np.ndarray | None
+    rendimiento_cnr: np.ndarray | None
+    rating: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.hedge_stake_b)
+
+    def row(self, index: int) -> CalculatorResult:
+        def pick(values: np.ndarray | None) -> float | None:
+            return None if values is None else float(values[index])
+
+        return CalculatorResult(
+            hedge_stake_b=float(self.hedge_stake_b[index]),
+            exposure_b=float(self.exposure_b[index]),
+            profit_a_wins=float(self.profit_a_wins[index]),
+            profit_b_wins=float(self.profit_b_wins[index]),
+            perdida_calificacion=pick(self.perdida_calificacion),
+            beneficio_cnr=pick(self.beneficio_cnr),
+            rendimiento_cnr=pick(self.rendimiento_cnr),
+            rating=pick(self.rating),
+        )
+
+
+@dataclass
+class SensitivityGrid:
+    """Calculator outputs over ``odds_b`` (rows) by ``commissions`` (columns).
+
+    ``metric`` is ``perdida_calificacion`` or ``beneficio_cnr`` depending on the mode.
+    """
+
+    mode: str
+    odds_b: np.ndarray
+    commissions: np.ndarray
+    metric: np.ndarray
+    rating: np.ndarray
+
+    @property
+    def metric_name(self) -> str:
+        return "perdida_calificacion" if self.mode == "calificacion" else "beneficio_cnr"
+
+
+@dataclass(frozen=True)
+class CalculationInputs:
+    stake_a: float
+    odds_a: float
+    odds_b: float
+    commission_b: float
+    mode: str
+    stake_source: str
+
+
+@dataclass(frozen=True)
+class CalculationOutput:
+    result: CalculatorResult
+    grid: SensitivityGrid
+    odds_a_tick: Decimal
+    odds_b_tick: Decimal
+
+
+# Above this bound an int64 numerator could overflow: the exposure numerator
+# grows with stake*odds_a*odds_b (in hundredths) and the rating numerator with
+# odds_a*1e8. Such rows go through the scalar path.
+_MAX_INT_PRODUCT = 1e16
+
+
+class CalculatorCache:
+    """Bounded, thread-safe LRU of calculator results with hit/miss counters.
+
+    ``maxsize=0`` disables caching while keeping the counters.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, CalculatorResult] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, loader: Callable[[], CalculatorResult]) -> CalculatorResult:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+        result = loader()
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_global_cache = CalculatorCache()
+
+
+def get_global_cache() -> CalculatorCache:
+    return _global_cache
+
+
 class CalculatorService:
+    def __init__(self, cache: CalculatorCache | None = None) -> None:
+        self.cache = cache if cache is not None else get_global_cache()
+
     def compute(
         self,
         *,
@@ -31,11 +167,82 @@ class CalculatorService:
         mode: str = "calificacion",
         stake_source: str = "efectivo",
     ) -> CalculatorResult:
+        # Validate before the lookup so bad input fails the same way whether or
+        # not an equivalent entry is already cached.
+        values = (stake_a, odds_a, odds_b, commission_b)
+        for label, value in zip(("stake_a", "odds_a", "odds_b", "commission_b"), values):
+            if isinstance(value, bool) or not isinstance(value, (int, float, Decimal)):
+                raise TypeError(f"{label} must be a number")
         ensure_positive(stake_a, "stake_a")
         ensure_odds_valid(odds_a)
         ensure_odds_valid(odds_b)
         ensure_commission_range(commission_b)
+        if mode not in ("calificacion", "credito_no_retorno"):
+            raise ValueError("Unknown mode")
+        # Results do not depend on stake_source, and on-grid inputs are keyed by
+        # their exact hundredths so 2, 2.0 and Decimal("2.00") share an entry.
+        grid = tuple(_grid_key(value) for value in values)
+        key = (mode, *grid) if None not in grid else (mode, "raw", *values)
+        return self.cache.get(
+            key,
+            lambda: self._compute(
+                stake_a=stake_a,
+                odds_a=odds_a,
+                odds_b=odds_b,
+                commission_b=commission_b,
+                mode=mode,
+                stake_source=stake_source,
+            ),
+        )
+
+    def _compute(
+        self,
+        *,
+        stake_a: float,
+        odds_a: float,
+        odds_b: float,
+        commission_b: float,
+        mode: str,
+        stake_source: str,
+    ) -> CalculatorResult:
+        s, a, b, k = (scaled(value) for value in (stake_a, odds_a, odds_b, commission_b))
+        if None not in (s, a, b, k):
+            hedge, exposure, profit_a, profit_b, rating_num, rating_den, ambiguous = _hedge_cents(
+                s, a, b, k, mode == "calificacion"
+            )
+            if not ambiguous:
+                worst = min(profit_a, profit_b)
+                calificacion = mode == "calificacion"
+                return CalculatorResult(
+                    hedge_stake_b=hedge / 100,
+                    exposure_b=exposure / 100,
+                    profit_a_wins=half_up_div(profit_a, 10_000) / 100,
+                    profit_b_wins=half_up_div(profit_b, 10_000) / 100,
+                    perdida_calificacion=-half_up_div(worst, 10_000) / 100 if calificacion else None,
+                    beneficio_cnr=None if calificacion else half_up_div(worst, 10_000) / 100,
+                    rendimiento_cnr=None if calificacion else half_up_div(worst, 100 * s) / 100,
+                    rating=half_up_div(rating_num, rating_den) / 100,
+                )
+        return self._compute_decimal(
+            stake_a=stake_a,
+            odds_a=odds_a,
+            odds_b=odds_b,
+            commission_b=commission_b,
+            mode=mode,
+            stake_source=stake_source,
+        )
 
+    def _compute_decimal(
+        self,
+        *,
+        stake_a: float,
+        odds_a: float,
+        odds_b: float,
+        commission_b: float,
+        mode: str,
+        stake_source: str,
+    ) -> CalculatorResult:
+        """Reference ``Decimal`` implementation, used off the two-decimal grid."""
         c = to_decimal(commission_b) / Decimal(100)
         stake_dec = to_decimal(stake_a)
         odds_a_dec = to_decimal(odds_a)
@@ -81,3 +288,184 @@ class CalculatorService:
             rendimiento_cnr=as_float(rendimiento) if rendimiento is not None else None,
             rating=as_float(rating),
         )
+
+    def sensitivity_grid(
+        self,
+        *,
+        stake_a: float,
+        odds_a: float,
+        odds_b_low: float,
+        odds_b_high: float,
+        commissions,
+        mode: str = "calificacion",
+        ladder: str = "default",
+    ) -> SensitivityGrid:
+        """Loss/profit and rating for every ladder price of ``odds_b`` in a range and each commission."""
+        prices = [price for price in get_ladder(ladder).between(odds_b_low, odds_b_high) if price > Decimal("1.01")]
+        if not prices:
+            raise ValueError("No valid odds_b ticks in range")
+        odds_b = np.array([float(price) for price in prices])
+        commissions = np.asarray(commissions, dtype=float).ravel()
+        batch = self.compute_batch(
+            stake_a=stake_a,
+            odds_a=odds_a,
+            odds_b=odds_b[:, np.newaxis],
+            commission_b=commissions[np.newaxis, :],
+            mode=mode,
+        )
+        shape = (len(odds_b), len(commissions))
+        metric = batch.perdida_calificacion if mode == "calificacion" else batch.beneficio_cnr
+        return SensitivityGrid(
+            mode=mode,
+            odds_b=odds_b,
+            commissions=commissions,
+            metric=metric.reshape(shape),
+            rating=batch.rating.reshape(shape),
+        )
+
+    def calculate(self, inputs: CalculationInputs, *, ticks: int, commissions) -> CalculationOutput:
+        """Everything the calculator form shows for one set of inputs.
+
+        The grid spans ``ticks`` ladder steps either side of odds B and every
+        commission in ``commissions`` plus the entered one.
+        """
+        result = self.compute(
+            stake_a=inputs.stake_a,
+            odds_a=inputs.odds_a,
+            odds_b=inputs.odds_b,
+            commission_b=inputs.commission_b,
+            mode=inputs.mode,
+            stake_source=inputs.stake_source,
+        )
+        ladder = get_ladder()
+        grid = self.sensitivity_grid(
+            stake_a=inputs.stake_a,
+            odds_a=inputs.odds_a,
+            odds_b_low=ladder.shift(inputs.odds_b, -ticks),
+            odds_b_high=ladder.shift(inputs.odds_b, ticks),
+            commissions=sorted({*commissions, inputs.commission_b}),
+            mode=inputs.mode,
+        )
+        return CalculationOutput(
+            result=result,
+            grid=grid,
+            odds_a_tick=validate_and_round_to_tick(inputs.odds_a),
+            odds_b_tick=validate_and_round_to_tick(inputs.odds_b),
+        )
+
+    def compute_batch(
+        self,
+        *,
+        stake_a,
+        odds_a,
+        odds_b,
+        commission_b=5.0,
+        mode: str = "calificacion",
+    ) -> CalculatorBatchResult:
+        """Vectorised :meth:`compute` over arrays (or scalars) that broadcast together.
+
+        Uses the same integer-cents core as :meth:`compute`; rows off the
+        two-decimal grid, too large for int64 or on a Decimal-only boundary are
+        delegated to :meth:`compute`.
+        """
+        if mode not in ("calificacion", "credito_no_retorno"):
+            raise ValueError("Unknown mode")
+        stake, odds_a, odds_b, commission = (
+            np.atleast_1d(np.asarray(values, dtype=float)).ravel()
+            for values in np.broadcast_arrays(stake_a, odds_a, odds_b, commission_b)
+        )
+        _ensure_all(stake > 0, "stake_a must be positive")
+        _ensure_all((odds_a > 1.01) & (odds_b > 1.01), "Odds must be greater than 1.01")
+        _ensure_all((commission >= 0) & (commission <= 10), "Commission must be between 0 and 10")
+
+        s, a, b, k, exact = _to_grid(stake, odds_a, odds_b, commission)
+        calificacion = mode == "calificacion"
+        hedge, exposure, profit_a, profit_b, rating_num, rating_den, ambiguous = _hedge_cents(
+            s, a, b, k, calificacion
+        )
+        exact &= ~ambiguous
+        worst = np.minimum(profit_a, profit_b)
+
+        result = CalculatorBatchResult(
+            hedge_stake_b=hedge / 100,
+            exposure_b=exposure / 100,
+            profit_a_wins=half_up_div(profit_a, 10_000) / 100,
+            profit_b_wins=half_up_div(profit_b, 10_000) / 100,
+            perdida_calificacion=-half_up_div(worst, 10_000) / 100 if calificacion else None,
+            beneficio_cnr=None if calificacion else half_up_div(worst, 10_000) / 100,
+            rendimiento_cnr=None if calificacion else half_up_div(worst, 100 * s) / 100,
+            rating=half_up_div(rating_num, rating_den) / 100,
+        )
+        for index in np.flatnonzero(~exact):
+            scalar = self.compute(
+                stake_a=float(stake[index]),
+                odds_a=float(odds_a[index]),
+                odds_b=float(odds_b[index]),
+                commission_b=float(commission[index]),
+                mode=mode,
+            )
+            for name in CalculatorResult.__dataclass_fields__:
+                column = getattr(result, name)
+                if column is not None:
+                    column[index] = getattr(scalar, name)
+        return result
+
+
+def _grid_key(value) -> int | None:
+    try:
+        return scaled(value)
+    except (TypeError, ValueError, ArithmeticError):
+        return None
+
+
+def _ensure_all(condition: np.ndarray, message: str) -> None:
+    if not condition.all():
+        raise ValueError(f"{message} (row {int(np.argmin(condition))})")
+
+
+def _to_grid(*columns: np.ndarray) -> tuple[np.ndarray, ...]:
+    """Scale each column to hundredths as int64 and flag rows that sit exactly on that grid.
+
+    A float equal to ``n / 100`` prints as that decimal, so ``Decimal(str(x))``
+    sees exactly the same value as the integer path.
+    """
+    exact = np.ones(len(columns[0]), dtype=bool)
+    grid = []
+    for column in columns:
+        hundredths = np.round(column * 100)
+        exact &= hundredths / 100 == column
+        grid.append(hundredths)
+    exact &= grid[0] * grid[1] * grid[2] < _MAX_INT_PRODUCT
+    exact &= grid[1] * 1e8 < _MAX_INT_PRODUCT
+    # Off-grid or oversized rows are recomputed by the scalar path; give them
+    # harmless values so the integer arithmetic cannot overflow meanwhile.
+    ints = [np.where(exact, column, 200).astype(np.int64) for column in grid]
+    ints[3] = np.where(exact, grid[3], 0).astype(np.int64)
+    return (*ints, exact)
+
+
+def _hedge_cents(s, a, b, k, calificacion: bool):
+    """Integer core of the calculator on hundredths; works on ints and int64 arrays.
+
+    Returns hedge and exposure in cents, both profits in millionths, the
+    rating in cents as a fraction and a flag for inputs whose result hinges on
+    the ``Decimal`` path's 28-digit intermediate rounding.
+    """
+    # Hedge = S*A'/(B - c) with A' = A (calificacion) or A - 1 (CNR); in cents:
+    # hedge_c = 100*s*a'/(100*b - k), exposure_c = hedge_c*(b - 100)/100.
+    hedge_num = 100 * s * (a if calificacion else a - 100)
+    divisor = 100 * b - k
+    hedge = ceil_div(hedge_num, divisor)
+    exposure_num = hedge_num * (b - 100)
+    exposure = ceil_div(exposure_num, 100 * divisor)
+    # Decimal rounds a non-terminating hedge before multiplying, which can push
+    # an exact-cent exposure either way; rating ties at half a cent likewise.
+    ambiguous = (exposure_num % (100 * divisor) == 0) & (hedge_num % divisor != 0)
+
+    # Profits in millionths: S*(A-1) - exposure and hedge*(1-c) [- S].
+    profit_a = (s * (a - 100) - 100 * exposure) * 100
+    profit_b = hedge * (10000 - k) - (10000 * s if calificacion else 0)
+    rating_num = 100 * a * (1_000_000 - b * k)
+    rating_den = b * (10000 - k)
+    ambiguous |= (2 * rating_num) % (2 * rating_den) == rating_den
+    return hedge, exposure, profit_a, profit_b, rating_num, rating_den, ambiguous
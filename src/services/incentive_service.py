@@ -1,13 +1,14 @@
 """Incentive management service."""
 from __future__ import annotations
 
-from dataclasses import asdict
-from datetime import datetime
+from dataclasses import asdict, fields
 from typing import List
 
-from ..data.db import get_connection, initialise_database, now_ts
+from ..data.db import fetch_tuples, get_connection, initialise_database
 from ..domain.models import Incentive
 
+INCENTIVE_COLUMNS = tuple(f.name for f in fields(Incentive))
+
 
 class IncentiveService:
     def __init__(self) -> None:
@@ -15,8 +16,8 @@ class IncentiveService:
 
     def list_incentives(self) -> List[Incentive]:
         with get_connection() as conn:
-            rows = conn.execute("SELECT * FROM incentives ORDER BY expiry_date").fetchall()
-            return [self._row_to_incentive(row) for row in rows]
+            rows = fetch_tuples(conn, f"SELECT {', '.join(INCENTIVE_COLUMNS)} FROM incentives ORDER BY expiry_date")
+        return [self._row_to_incentive(row) for row in rows]
 
     def create_incentive(self, incentive: Incentive) -> Incentive:
         payload = asdict(incentive)
@@ -32,15 +33,6 @@ class IncentiveService:
             incentive.id = cursor.lastrowid
         return incentive
 
-    def _row_to_incentive(self, row) -> Incentive:
-        return Incentive(
-            id=row["id"],
-            account_id=row["account_id"],
-            title=row["title"],
-            type=row["type"],
-            req_stake=row["req_stake"],
-            min_odds=row["min_odds"],
-            expiry_date=row["expiry_date"],
-            status=row["status"],
-            notes=row["notes"],
-        )
+    @staticmethod
+    def _row_to_incentive(row: tuple) -> Incentive:
+        return Incentive(*row)
@@ -1,38 +1,155 @@
 """Operations lifecycle management."""
 from __future__ import annotations
 
-from dataclasses import asdict
-from datetime import UTC, datetime
-from typing import List
+from dataclasses import asdict, dataclass, field, fields
+from datetime import UTC, date, datetime
+from typing import Any, Iterable, List, Mapping
 
-from ..data.db import get_connection, initialise_database, now_ts
-from ..domain.models import Operation
+from ..data.db import (
+    after_commit,
+    fetch_tuples,
+    get_connection,
+    initialise_database,
+    now_ts,
+    parse_ts,
+    transaction,
+)
+from ..domain.models import Operation, Transaction
+from ..utils.events import (
+    OPERATION_CANCELLED,
+    OPERATION_CREATED,
+    OPERATION_SETTLED,
+    OPERATION_UPDATED,
+    TRANSACTION_APPLIED,
+    EventBus,
+    get_global_bus,
+)
+from ..utils.money import net_of_commission, odds_profit
 from .account_service import AccountService
 from .calculator_service import CalculatorService
 
+# Columns selected in ``Operation`` field order so rows decode positionally.
+OPERATION_COLUMNS = tuple(f.name for f in fields(Operation))
+_OPERATION_SELECT = f"SELECT {', '.join(OPERATION_COLUMNS)} FROM operations"
+_ID = OPERATION_COLUMNS.index("id")
+_TS = OPERATION_COLUMNS.index("ts")
+_SETTLED_AT = OPERATION_COLUMNS.index("settled_at")
+
+_INSERT_OPERATION = """
+    INSERT INTO operations (
+        ts, origin_account_id, hedge_account_id, event, mode, stake_source,
+        stake_a, odds_a, hedge_stake_b, odds_b, exposure_b, commission_b,
+        profit_a_wins, profit_b_wins, perdida_calificacion, beneficio_cnr,
+        rendimiento_cnr, rating, status, settled_at, settlement_note, notes
+    ) VALUES (:ts,:origin_account_id,:hedge_account_id,:event,:mode,:stake_source,
+        :stake_a,:odds_a,:hedge_stake_b,:odds_b,:exposure_b,:commission_b,
+        :profit_a_wins,:profit_b_wins,:perdida_calificacion,:beneficio_cnr,
+        :rendimiento_cnr,:rating,:status,:settled_at,:settlement_note,:notes)
+"""
+
+
+# Each of these has a (column, id) index, so keyset pages never sort.
+SORTABLE_COLUMNS = frozenset({"id", "ts", "event", "stake_a", "hedge_stake_b", "status"})
+
+
+def _ts_bound(value: date) -> str:
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(UTC)
+        return value.isoformat(timespec="seconds")
+    return value.isoformat()
+
+
+def _and(where: str, clause: str) -> str:
+    return f"{where} AND {clause}" if where else f"WHERE {clause}"
+
+
+@dataclass
+class OperationPage:
+    items: List[Operation]
+    next_cursor: tuple[str, int] | None = None
+
+
+@dataclass
+class BulkCreateResult:
+    created: List[Operation] = field(default_factory=list)
+    errors: List[tuple[int, str]] = field(default_factory=list)
+
 
 class OperationService:
-    def __init__(self, account_service: AccountService | None = None) -> None:
+    def __init__(self, account_service: AccountService | None = None, bus: EventBus | None = None) -> None:
         initialise_database()
-        self.account_service = account_service or AccountService()
+        self.bus = bus or (account_service.bus if account_service else get_global_bus())
+        self.account_service = account_service or AccountService(self.bus)
         self.calculator = CalculatorService()
 
     def list_operations(self, *, include_cancelled: bool = True) -> List[Operation]:
-        query = "SELECT * FROM operations"
-        params: tuple[object, ...] = ()
-        if not include_cancelled:
-            query += " WHERE status != 'CANCELADA'"
-        query += " ORDER BY ts DESC"
+        where, params = self._operation_filters(include_cancelled=include_cancelled)
+        query = f"{_OPERATION_SELECT} {where} ORDER BY ts DESC"
         with get_connection() as conn:
-            rows = conn.execute(query, params).fetchall()
+            rows = fetch_tuples(conn, query, params)
         return [self._row_to_operation(row) for row in rows]
 
+    def query_operations(
+        self,
+        *,
+        status: str | Iterable[str] | None = None,
+        account_id: int | None = None,
+        mode: str | None = None,
+        event: str | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        include_cancelled: bool = True,
+        order_by: str = "ts",
+        descending: bool = True,
+        after: tuple[Any, int] | None = None,
+        limit: int = 100,
+    ) -> OperationPage:
+        """Return one page of operations, newest first by default.
+
+        ``account_id`` matches either leg, ``start`` is inclusive and ``end``
+        exclusive. Pass the previous page's ``next_cursor`` as ``after`` to
+        continue; the ``(order_by, id)`` keyset keeps every page equally cheap.
+        """
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        if order_by not in SORTABLE_COLUMNS:
+            raise ValueError(f"Cannot sort operations by {order_by!r}")
+        where, params = self._operation_filters(
+            status=status,
+            mode=mode,
+            event=event,
+            start=start,
+            end=end,
+            include_cancelled=include_cancelled,
+        )
+        direction = "DESC" if descending else "ASC"
+        if after is not None:
+            where = _and(where, f"({order_by}, id) {'<' if descending else '>'} (?, ?)")
+            params = (*params, *after)
+        order = f"ORDER BY {order_by} {direction}, id {direction}"
+        if account_id is None:
+            query = f"{_OPERATION_SELECT} {where} {order} LIMIT ?"
+        else:
+            # One leg per account column, each read in order from its own
+            # (account, ts) index and merged; an OR of both columns forces a sort.
+            query = (
+                f"{_OPERATION_SELECT} {_and(where, 'origin_account_id = ?')} UNION ALL "
+                f"{_OPERATION_SELECT} {_and(where, 'hedge_account_id = ? AND origin_account_id != ?')} "
+                f"{order} LIMIT ?"
+            )
+            params = (*params, account_id, *params, account_id, account_id)
+        with get_connection() as conn:
+            rows = fetch_tuples(conn, query, (*params, limit + 1))
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1][OPERATION_COLUMNS.index(order_by)], rows[-1][_ID])
+        return OperationPage(items=[self._row_to_operation(row) for row in rows], next_cursor=next_cursor)
+
     def get_operation(self, operation_id: int) -> Operation:
         with get_connection() as conn:
-            row = conn.execute("SELECT * FROM operations WHERE id=?", (operation_id,)).fetchone()
-        if not row:
-            raise ValueError("Operation not found")
-        return self._row_to_operation(row)
+            return self._fetch_operation(conn, operation_id)
 
     def create_operation(
         self,
@@ -47,23 +164,7 @@ class OperationService:
         odds_b: float,
         commission_b: float,
     ) -> Operation:
-        calc = self.calculator.compute(
-            stake_a=stake_a,
-            odds_a=odds_a,
-            odds_b=odds_b,
-            commission_b=commission_b,
-            mode=mode,
-            stake_source=stake_source,
-        )
-
-        deficit_origin = 0.0 if stake_source == "credito" else self.account_service.ensure_funds(origin_account_id, stake_a)
-        deficit_hedge = self.account_service.ensure_funds(hedge_account_id, calc.exposure_b)
-        if deficit_origin > 0 or deficit_hedge > 0:
-            raise ValueError("Fondos insuficientes para crear la operación")
-
-        operation = Operation(
-            id=None,
-            ts=datetime.now(UTC),
+        operation = self._build_operation(
             origin_account_id=origin_account_id,
             hedge_account_id=hedge_account_id,
             event=event,
@@ -71,56 +172,137 @@ class OperationService:
             stake_source=stake_source,
             stake_a=stake_a,
             odds_a=odds_a,
-            hedge_stake_b=calc.hedge_stake_b,
             odds_b=odds_b,
-            exposure_b=calc.exposure_b,
             commission_b=commission_b,
-            profit_a_wins=calc.profit_a_wins,
-            profit_b_wins=calc.profit_b_wins,
-            perdida_calificacion=calc.perdida_calificacion,
-            beneficio_cnr=calc.beneficio_cnr,
-            rendimiento_cnr=calc.rendimiento_cnr,
-            rating=calc.rating,
-            status="PENDIENTE",
         )
 
-        payload = asdict(operation)
-        payload.pop("id")
-        payload["ts"] = operation.ts.isoformat(timespec="seconds")
-        payload["settled_at"] = None
+        with transaction() as conn:
+            deficit_origin = 0.0 if stake_source == "credito" else self.account_service.ensure_funds(origin_account_id, stake_a)
+            deficit_hedge = self.account_service.ensure_funds(hedge_account_id, operation.exposure_b)
+            if deficit_origin > 0 or deficit_hedge > 0:
+                raise ValueError("Fondos insuficientes para crear la operación")
 
-        with get_connection() as conn:
-            cursor = conn.execute(
-                """
-                INSERT INTO operations (
-                    ts, origin_account_id, hedge_account_id, event, mode, stake_source,
-                    stake_a, odds_a, hedge_stake_b, odds_b, exposure_b, commission_b,
-                    profit_a_wins, profit_b_wins, perdida_calificacion, beneficio_cnr,
-                    rendimiento_cnr, rating, status, settled_at, settlement_note, notes
-                ) VALUES (:ts,:origin_account_id,:hedge_account_id,:event,:mode,:stake_source,
-                    :stake_a,:odds_a,:hedge_stake_b,:odds_b,:exposure_b,:commission_b,
-                    :profit_a_wins,:profit_b_wins,:perdida_calificacion,:beneficio_cnr,
-                    :rendimiento_cnr,:rating,:status,:settled_at,:settlement_note,:notes)
-                """,
-                payload,
-            )
+            cursor = conn.execute(_INSERT_OPERATION, self._operation_payload(operation))
             operation.id = cursor.lastrowid
 
-        if stake_source == "efectivo":
+            if stake_source == "efectivo":
+                self.account_service.apply_transaction(
+                    account_id=origin_account_id,
+                    kind="op_lock",
+                    amount=-stake_a,
+                    ref_operation_id=operation.id,
+                )
             self.account_service.apply_transaction(
-                account_id=origin_account_id,
+                account_id=hedge_account_id,
                 kind="op_lock",
-                amount=-stake_a,
+                amount=-operation.exposure_b,
                 ref_operation_id=operation.id,
             )
-        self.account_service.apply_transaction(
-            account_id=hedge_account_id,
-            kind="op_lock",
-            amount=-calc.exposure_b,
-            ref_operation_id=operation.id,
-        )
+            self._publish_after_commit(OPERATION_CREATED, operation)
         return operation
 
+    def create_operations_bulk(self, rows: Iterable[Mapping[str, Any]]) -> BulkCreateResult:
+        """Create many operations with one fund check pass and one commit.
+
+        Each row takes the keyword arguments of :meth:`create_operation`. Rows
+        that fail validation or would overdraw an account are reported in
+        ``errors`` by their position and skipped; the rest are written with
+        ``executemany`` inside a single transaction.
+        """
+        result = BulkCreateResult()
+        prepared: list[tuple[int, Operation]] = []
+        for index, row in enumerate(rows):
+            try:
+                prepared.append((index, self._build_operation(**row)))
+            except (ArithmeticError, TypeError, ValueError) as exc:
+                result.errors.append((index, str(exc)))
+        if not prepared:
+            return result
+
+        with transaction() as conn:
+            account_ids = sorted(
+                {op.origin_account_id for _, op in prepared} | {op.hedge_account_id for _, op in prepared}
+            )
+            placeholders = ",".join("?" * len(account_ids))
+            balances: dict[int, float] = {
+                row[0]: float(row[1])
+                for row in conn.execute(
+                    f"SELECT id, balance FROM accounts WHERE id IN ({placeholders})",
+                    account_ids,
+                )
+            }
+
+            accepted: list[Operation] = []
+            locks: list[tuple[int, int, float, float]] = []
+            for index, operation in prepared:
+                if operation.origin_account_id not in balances or operation.hedge_account_id not in balances:
+                    result.errors.append((index, "Account not found"))
+                    continue
+                origin_required = operation.stake_a if operation.stake_source == "efectivo" else 0.0
+                if (
+                    origin_required - balances[operation.origin_account_id] > 0
+                    or operation.exposure_b - balances[operation.hedge_account_id] > 0
+                ):
+                    result.errors.append((index, "Fondos insuficientes para crear la operación"))
+                    continue
+                position = len(accepted)
+                accepted.append(operation)
+                if operation.stake_source == "efectivo":
+                    balances[operation.origin_account_id] -= operation.stake_a
+                    locks.append(
+                        (position, operation.origin_account_id, -operation.stake_a, balances[operation.origin_account_id])
+                    )
+                balances[operation.hedge_account_id] -= operation.exposure_b
+                locks.append(
+                    (position, operation.hedge_account_id, -operation.exposure_b, balances[operation.hedge_account_id])
+                )
+
+            if accepted:
+                last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM operations").fetchone()[0]
+                conn.executemany(_INSERT_OPERATION, [self._operation_payload(op) for op in accepted])
+                new_ids = [
+                    row[0] for row in conn.execute("SELECT id FROM operations WHERE id > ? ORDER BY id", (last_id,))
+                ]
+                for operation, operation_id in zip(accepted, new_ids):
+                    operation.id = operation_id
+
+                ts_value = now_ts()
+                last_tx_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()[0]
+                conn.executemany(
+                    """
+                    INSERT INTO transactions (account_id, ts, kind, amount, balance_after, ref_operation_id)
+                    VALUES (?,?,'op_lock',?,?,?)
+                    """,
+                    [
+                        (account_id, ts_value, amount, balance_after, accepted[position].id)
+                        for position, account_id, amount, balance_after in locks
+                    ],
+                )
+                tx_ids = [
+                    row[0] for row in conn.execute("SELECT id FROM transactions WHERE id > ? ORDER BY id", (last_tx_id,))
+                ]
+                for tx_id, (position, account_id, amount, balance_after) in zip(tx_ids, locks):
+                    applied = Transaction(
+                        id=tx_id,
+                        account_id=account_id,
+                        ts=datetime.fromisoformat(ts_value),
+                        kind="op_lock",
+                        amount=amount,
+                        balance_after=balance_after,
+                        ref_operation_id=accepted[position].id,
+                    )
+                    after_commit(lambda applied=applied: self.bus.publish(TRANSACTION_APPLIED, applied))
+                touched = {account_id for _, account_id, _, _ in locks}
+                conn.executemany(
+                    "UPDATE accounts SET balance=?, updated_at=? WHERE id=?",
+                    [(balances[account_id], ts_value, account_id) for account_id in sorted(touched)],
+                )
+            result.created.extend(accepted)
+            for operation in accepted:
+                self._publish_after_commit(OPERATION_CREATED, operation)
+        result.errors.sort()
+        return result
+
     def update_operation(
         self,
         operation_id: int,
@@ -136,151 +318,147 @@ class OperationService:
         commission_b: float,
         note: str | None = None,
     ) -> Operation:
-        with get_connection() as conn:
-            row = conn.execute("SELECT * FROM operations WHERE id=?", (operation_id,)).fetchone()
-        if not row:
-            raise ValueError("Operation not found")
-        operation = self._row_to_operation(row)
+        with transaction() as conn:
+            operation = self._fetch_operation(conn, operation_id)
 
-        if operation.status != "PENDIENTE":
-            raise ValueError("Solo se pueden editar operaciones pendientes")
+            if operation.status != "PENDIENTE":
+                raise ValueError("Solo se pueden editar operaciones pendientes")
 
-        calc = self.calculator.compute(
-            stake_a=stake_a,
-            odds_a=odds_a,
-            odds_b=odds_b,
-            commission_b=commission_b,
-            mode=mode,
-            stake_source=stake_source,
-        )
+            calc = self.calculator.compute(
+                stake_a=stake_a,
+                odds_a=odds_a,
+                odds_b=odds_b,
+                commission_b=commission_b,
+                mode=mode,
+                stake_source=stake_source,
+            )
 
-        note_text = note or "Actualización operación"
+            note_text = note or "Actualización operación"
 
-        # Ajustar bloqueos de la cuenta de origen
-        if operation.origin_account_id != origin_account_id:
-            if operation.stake_source == "efectivo":
-                self.account_service.apply_transaction(
-                    account_id=operation.origin_account_id,
-                    kind="op_release",
-                    amount=operation.stake_a,
-                    ref_operation_id=operation.id,
-                    note=note_text,
-                )
-            if stake_source == "efectivo":
-                deficit = self.account_service.ensure_funds(origin_account_id, stake_a)
-                if deficit > 0:
-                    raise ValueError("Fondos insuficientes para actualizar la operación")
-                self.account_service.apply_transaction(
-                    account_id=origin_account_id,
-                    kind="op_lock",
-                    amount=-stake_a,
-                    ref_operation_id=operation.id,
-                    note=note_text,
-                )
-        else:
-            if operation.stake_source == "efectivo" and stake_source == "efectivo":
-                delta = stake_a - operation.stake_a
-                if delta > 0:
-                    deficit = self.account_service.ensure_funds(origin_account_id, delta)
+            # Ajustar bloqueos de la cuenta de origen
+            if operation.origin_account_id != origin_account_id:
+                if operation.stake_source == "efectivo":
+                    self.account_service.apply_transaction(
+                        account_id=operation.origin_account_id,
+                        kind="op_release",
+                        amount=operation.stake_a,
+                        ref_operation_id=operation.id,
+                        note=note_text,
+                    )
+                if stake_source == "efectivo":
+                    deficit = self.account_service.ensure_funds(origin_account_id, stake_a)
                     if deficit > 0:
                         raise ValueError("Fondos insuficientes para actualizar la operación")
                     self.account_service.apply_transaction(
                         account_id=origin_account_id,
                         kind="op_lock",
-                        amount=-delta,
+                        amount=-stake_a,
                         ref_operation_id=operation.id,
                         note=note_text,
                     )
-                elif delta < 0:
+            else:
+                if operation.stake_source == "efectivo" and stake_source == "efectivo":
+                    delta = stake_a - operation.stake_a
+                    if delta > 0:
+                        deficit = self.account_service.ensure_funds(origin_account_id, delta)
+                        if deficit > 0:
+                            raise ValueError("Fondos insuficientes para actualizar la operación")
+                        self.account_service.apply_transaction(
+                            account_id=origin_account_id,
+                            kind="op_lock",
+                            amount=-delta,
+                            ref_operation_id=operation.id,
+                            note=note_text,
+                        )
+                    elif delta < 0:
+                        self.account_service.apply_transaction(
+                            account_id=origin_account_id,
+                            kind="op_release",
+                            amount=-delta,
+                            ref_operation_id=operation.id,
+                            note=note_text,
+                        )
+                elif operation.stake_source == "efectivo" and stake_source == "credito":
                     self.account_service.apply_transaction(
-                        account_id=origin_account_id,
+                        account_id=operation.origin_account_id,
                         kind="op_release",
-                        amount=-delta,
+                        amount=operation.stake_a,
+                        ref_operation_id=operation.id,
+                        note=note_text,
+                    )
+                elif operation.stake_source == "credito" and stake_source == "efectivo":
+                    deficit = self.account_service.ensure_funds(origin_account_id, stake_a)
+                    if deficit > 0:
+                        raise ValueError("Fondos insuficientes para actualizar la operación")
+                    self.account_service.apply_transaction(
+                        account_id=origin_account_id,
+                        kind="op_lock",
+                        amount=-stake_a,
                         ref_operation_id=operation.id,
                         note=note_text,
                     )
-            elif operation.stake_source == "efectivo" and stake_source == "credito":
+
+            # Ajustar bloqueos de la cuenta de cobertura
+            if operation.hedge_account_id != hedge_account_id:
                 self.account_service.apply_transaction(
-                    account_id=operation.origin_account_id,
+                    account_id=operation.hedge_account_id,
                     kind="op_release",
-                    amount=operation.stake_a,
-                    ref_operation_id=operation.id,
-                    note=note_text,
-                )
-            elif operation.stake_source == "credito" and stake_source == "efectivo":
-                deficit = self.account_service.ensure_funds(origin_account_id, stake_a)
-                if deficit > 0:
-                    raise ValueError("Fondos insuficientes para actualizar la operación")
-                self.account_service.apply_transaction(
-                    account_id=origin_account_id,
-                    kind="op_lock",
-                    amount=-stake_a,
+                    amount=operation.exposure_b,
                     ref_operation_id=operation.id,
                     note=note_text,
                 )
-
-        # Ajustar bloqueos de la cuenta de cobertura
-        if operation.hedge_account_id != hedge_account_id:
-            self.account_service.apply_transaction(
-                account_id=operation.hedge_account_id,
-                kind="op_release",
-                amount=operation.exposure_b,
-                ref_operation_id=operation.id,
-                note=note_text,
-            )
-            deficit = self.account_service.ensure_funds(hedge_account_id, calc.exposure_b)
-            if deficit > 0:
-                raise ValueError("Fondos insuficientes para actualizar la operación")
-            self.account_service.apply_transaction(
-                account_id=hedge_account_id,
-                kind="op_lock",
-                amount=-calc.exposure_b,
-                ref_operation_id=operation.id,
-                note=note_text,
-            )
-        else:
-            delta_exposure = calc.exposure_b - operation.exposure_b
-            if delta_exposure > 0:
-                deficit = self.account_service.ensure_funds(hedge_account_id, delta_exposure)
+                deficit = self.account_service.ensure_funds(hedge_account_id, calc.exposure_b)
                 if deficit > 0:
                     raise ValueError("Fondos insuficientes para actualizar la operación")
                 self.account_service.apply_transaction(
                     account_id=hedge_account_id,
                     kind="op_lock",
-                    amount=-delta_exposure,
-                    ref_operation_id=operation.id,
-                    note=note_text,
-                )
-            elif delta_exposure < 0:
-                self.account_service.apply_transaction(
-                    account_id=hedge_account_id,
-                    kind="op_release",
-                    amount=-delta_exposure,
+                    amount=-calc.exposure_b,
                     ref_operation_id=operation.id,
                     note=note_text,
                 )
+            else:
+                delta_exposure = calc.exposure_b - operation.exposure_b
+                if delta_exposure > 0:
+                    deficit = self.account_service.ensure_funds(hedge_account_id, delta_exposure)
+                    if deficit > 0:
+                        raise ValueError("Fondos insuficientes para actualizar la operación")
+                    self.account_service.apply_transaction(
+                        account_id=hedge_account_id,
+                        kind="op_lock",
+                        amount=-delta_exposure,
+                        ref_operation_id=operation.id,
+                        note=note_text,
+                    )
+                elif delta_exposure < 0:
+                    self.account_service.apply_transaction(
+                        account_id=hedge_account_id,
+                        kind="op_release",
+                        amount=-delta_exposure,
+                        ref_operation_id=operation.id,
+                        note=note_text,
+                    )
 
-        payload = {
-            "origin_account_id": origin_account_id,
-            "hedge_account_id": hedge_account_id,
-            "event": event,
-            "mode": mode,
-            "stake_source": stake_source,
-            "stake_a": stake_a,
-            "odds_a": odds_a,
-            "hedge_stake_b": calc.hedge_stake_b,
-            "odds_b": odds_b,
-            "exposure_b": calc.exposure_b,
-            "commission_b": commission_b,
-            "profit_a_wins": calc.profit_a_wins,
-            "profit_b_wins": calc.profit_b_wins,
-            "perdida_calificacion": calc.perdida_calificacion,
-            "beneficio_cnr": calc.beneficio_cnr,
-            "rendimiento_cnr": calc.rendimiento_cnr,
-            "rating": calc.rating,
-        }
+            payload = {
+                "origin_account_id": origin_account_id,
+                "hedge_account_id": hedge_account_id,
+                "event": event,
+                "mode": mode,
+                "stake_source": stake_source,
+                "stake_a": stake_a,
+                "odds_a": odds_a,
+                "hedge_stake_b": calc.hedge_stake_b,
+                "odds_b": odds_b,
+                "exposure_b": calc.exposure_b,
+                "commission_b": commission_b,
+                "profit_a_wins": calc.profit_a_wins,
+                "profit_b_wins": calc.profit_b_wins,
+                "perdida_calificacion": calc.perdida_calificacion,
+                "beneficio_cnr": calc.beneficio_cnr,
+                "rendimiento_cnr": calc.rendimiento_cnr,
+                "rating": calc.rating,
+            }
 
-        with get_connection() as conn:
             conn.execute(
                 """
                 UPDATE operations SET
@@ -305,174 +483,240 @@ class OperationService:
                 """,
                 payload | {"id": operation_id},
             )
-            row = conn.execute("SELECT * FROM operations WHERE id=?", (operation_id,)).fetchone()
-        return self._row_to_operation(row)
+            updated = self._fetch_operation(conn, operation_id)
+            self._publish_after_commit(OPERATION_UPDATED, updated)
+        return updated
 
     def settle_operation(self, operation_id: int, outcome: str, note: str | None = None) -> Operation:
-        with get_connection() as conn:
-            row = conn.execute("SELECT * FROM operations WHERE id=?", (operation_id,)).fetchone()
-            if not row:
-                raise ValueError("Operation not found")
-            operation = self._row_to_operation(row)
-
-        if operation.status != "PENDIENTE":
-            raise ValueError("Operation already settled")
-
         if outcome not in {"GANA_A", "GANA_B", "ANULADA"}:
             raise ValueError("Invalid outcome")
 
-        settlement_ts = datetime.now(UTC).isoformat(timespec="seconds")
-        with get_connection() as conn:
+        with transaction() as conn:
+            operation = self._fetch_operation(conn, operation_id)
+            if operation.status != "PENDIENTE":
+                raise ValueError("Operation already settled")
+
+            settlement_ts = datetime.now(UTC).isoformat(timespec="seconds")
             conn.execute(
                 "UPDATE operations SET status=?, settled_at=?, settlement_note=? WHERE id=?",
                 (outcome, settlement_ts, note, operation_id),
             )
 
-        if outcome == "GANA_A":
-            if operation.stake_source == "efectivo":
+            if outcome == "GANA_A":
+                if operation.stake_source == "efectivo":
+                    self.account_service.apply_transaction(
+                        account_id=operation.origin_account_id,
+                        kind="op_release",
+                        amount=operation.stake_a,
+                        ref_operation_id=operation_id,
+                    )
+                winnings = odds_profit(operation.stake_a, operation.odds_a)
                 self.account_service.apply_transaction(
                     account_id=operation.origin_account_id,
-                    kind="op_release",
-                    amount=operation.stake_a,
+                    kind="op_settlement",
+                    amount=winnings,
                     ref_operation_id=operation_id,
+                    note="Ganó origen",
                 )
-            winnings = operation.stake_a * (operation.odds_a - 1)
-            self.account_service.apply_transaction(
-                account_id=operation.origin_account_id,
-                kind="op_settlement",
-                amount=winnings,
-                ref_operation_id=operation_id,
-                note="Ganó origen",
-            )
-            self.account_service.apply_transaction(
-                account_id=operation.hedge_account_id,
-                kind="op_release",
-                amount=operation.exposure_b,
-                ref_operation_id=operation_id,
-            )
-            self.account_service.apply_transaction(
-                account_id=operation.hedge_account_id,
-                kind="op_settlement",
-                amount=-operation.exposure_b,
-                ref_operation_id=operation_id,
-                note="Pagada cobertura",
-            )
-        elif outcome == "GANA_B":
-            if operation.stake_source == "efectivo":
                 self.account_service.apply_transaction(
-                    account_id=operation.origin_account_id,
+                    account_id=operation.hedge_account_id,
                     kind="op_release",
-                    amount=operation.stake_a,
+                    amount=operation.exposure_b,
                     ref_operation_id=operation_id,
-                    note="Liberado stake",
                 )
                 self.account_service.apply_transaction(
-                    account_id=operation.origin_account_id,
+                    account_id=operation.hedge_account_id,
                     kind="op_settlement",
-                    amount=-operation.stake_a,
+                    amount=-operation.exposure_b,
                     ref_operation_id=operation_id,
-                    note="Perdió origen",
+                    note="Pagada cobertura",
                 )
-            else:
+            elif outcome == "GANA_B":
+                if operation.stake_source == "efectivo":
+                    self.account_service.apply_transaction(
+                        account_id=operation.origin_account_id,
+                        kind="op_release",
+                        amount=operation.stake_a,
+                        ref_operation_id=operation_id,
+                        note="Liberado stake",
+                    )
+                    self.account_service.apply_transaction(
+                        account_id=operation.origin_account_id,
+                        kind="op_settlement",
+                        amount=-operation.stake_a,
+                        ref_operation_id=operation_id,
+                        note="Perdió origen",
+                    )
+                else:
+                    self.account_service.apply_transaction(
+                        account_id=operation.origin_account_id,
+                        kind="op_release",
+                        amount=0.0,
+                        ref_operation_id=operation_id,
+                    )
                 self.account_service.apply_transaction(
-                    account_id=operation.origin_account_id,
+                    account_id=operation.hedge_account_id,
                     kind="op_release",
-                    amount=0.0,
+                    amount=operation.exposure_b,
                     ref_operation_id=operation_id,
                 )
-            self.account_service.apply_transaction(
-                account_id=operation.hedge_account_id,
-                kind="op_release",
-                amount=operation.exposure_b,
-                ref_operation_id=operation_id,
-            )
-            net = operation.hedge_stake_b * (1 - operation.commission_b / 100)
-            self.account_service.apply_transaction(
-                account_id=operation.hedge_account_id,
-                kind="op_settlement",
-                amount=net,
-                ref_operation_id=operation_id,
-                note="Ganó cobertura",
-            )
-        else:  # ANULADA
-            if operation.stake_source == "efectivo":
+                net = net_of_commission(operation.hedge_stake_b, operation.commission_b)
                 self.account_service.apply_transaction(
-                    account_id=operation.origin_account_id,
+                    account_id=operation.hedge_account_id,
+                    kind="op_settlement",
+                    amount=net,
+                    ref_operation_id=operation_id,
+                    note="Ganó cobertura",
+                )
+            else:  # ANULADA
+                if operation.stake_source == "efectivo":
+                    self.account_service.apply_transaction(
+                        account_id=operation.origin_account_id,
+                        kind="op_release",
+                        amount=operation.stake_a,
+                        ref_operation_id=operation_id,
+                        note="Anulada",
+                    )
+                self.account_service.apply_transaction(
+                    account_id=operation.hedge_account_id,
                     kind="op_release",
-                    amount=operation.stake_a,
+                    amount=operation.exposure_b,
                     ref_operation_id=operation_id,
                     note="Anulada",
                 )
-            self.account_service.apply_transaction(
-                account_id=operation.hedge_account_id,
-                kind="op_release",
-                amount=operation.exposure_b,
-                ref_operation_id=operation_id,
-                note="Anulada",
-            )
 
-        with get_connection() as conn:
-            row = conn.execute("SELECT * FROM operations WHERE id=?", (operation_id,)).fetchone()
-            return self._row_to_operation(row)
+            settled = self._fetch_operation(conn, operation_id)
+            self._publish_after_commit(OPERATION_SETTLED, settled)
+        return settled
 
     def cancel_operation(self, operation_id: int, *, note: str | None = None) -> Operation:
-        with get_connection() as conn:
-            row = conn.execute("SELECT * FROM operations WHERE id=?", (operation_id,)).fetchone()
-            if not row:
-                raise ValueError("Operation not found")
-            operation = self._row_to_operation(row)
-
-        if operation.status != "PENDIENTE":
-            raise ValueError("Solo se pueden cancelar operaciones pendientes")
+        with transaction() as conn:
+            operation = self._fetch_operation(conn, operation_id)
+            if operation.status != "PENDIENTE":
+                raise ValueError("Solo se pueden cancelar operaciones pendientes")
 
-        if operation.stake_source == "efectivo":
+            if operation.stake_source == "efectivo":
+                self.account_service.apply_transaction(
+                    account_id=operation.origin_account_id,
+                    kind="op_release",
+                    amount=operation.stake_a,
+                    ref_operation_id=operation.id,
+                    note=note or "Operación cancelada",
+                )
             self.account_service.apply_transaction(
-                account_id=operation.origin_account_id,
+                account_id=operation.hedge_account_id,
                 kind="op_release",
-                amount=operation.stake_a,
+                amount=operation.exposure_b,
                 ref_operation_id=operation.id,
                 note=note or "Operación cancelada",
             )
-        self.account_service.apply_transaction(
-            account_id=operation.hedge_account_id,
-            kind="op_release",
-            amount=operation.exposure_b,
-            ref_operation_id=operation.id,
-            note=note or "Operación cancelada",
-        )
 
-        settled_ts = datetime.now(UTC).isoformat(timespec="seconds")
-        with get_connection() as conn:
+            settled_ts = datetime.now(UTC).isoformat(timespec="seconds")
             conn.execute(
                 "UPDATE operations SET status=?, settled_at=?, settlement_note=? WHERE id=?",
                 ("CANCELADA", settled_ts, note, operation_id),
             )
-            row = conn.execute("SELECT * FROM operations WHERE id=?", (operation_id,)).fetchone()
-        return self._row_to_operation(row)
+            cancelled = self._fetch_operation(conn, operation_id)
+            self._publish_after_commit(OPERATION_CANCELLED, cancelled)
+        return cancelled
+
+    @staticmethod
+    def _operation_filters(
+        *,
+        status: str | Iterable[str] | None = None,
+        mode: str | None = None,
+        event: str | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        include_cancelled: bool = True,
+    ) -> tuple[str, tuple[object, ...]]:
+        clauses: list[str] = []
+        params: list[object] = []
+        if status is not None:
+            statuses = [status] if isinstance(status, str) else list(status)
+            clauses.append(f"status IN ({','.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if not include_cancelled:
+            clauses.append("status != 'CANCELADA'")
+        if mode is not None:
+            clauses.append("mode = ?")
+            params.append(mode)
+        if event is not None:
+            clauses.append("event = ?")
+            params.append(event)
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(_ts_bound(start))
+        if end is not None:
+            clauses.append("ts < ?")
+            params.append(_ts_bound(end))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, tuple(params)
 
-    def _row_to_operation(self, row) -> Operation:
+    def _build_operation(
+        self,
+        *,
+        origin_account_id: int,
+        hedge_account_id: int,
+        event: str,
+        mode: str,
+        stake_source: str,
+        stake_a: float,
+        odds_a: float,
+        odds_b: float,
+        commission_b: float,
+    ) -> Operation:
+        calc = self.calculator.compute(
+            stake_a=stake_a,
+            odds_a=odds_a,
+            odds_b=odds_b,
+            commission_b=commission_b,
+            mode=mode,
+            stake_source=stake_source,
+        )
         return Operation(
-            id=row["id"],
-            ts=datetime.fromisoformat(row["ts"]),
-            origin_account_id=row["origin_account_id"],
-            hedge_account_id=row["hedge_account_id"],
-            event=row["event"],
-            mode=row["mode"],
-            stake_source=row["stake_source"],
-            stake_a=row["stake_a"],
-            odds_a=row["odds_a"],
-            hedge_stake_b=row["hedge_stake_b"],
-            odds_b=row["odds_b"],
-            exposure_b=row["exposure_b"],
-            commission_b=row["commission_b"],
-            profit_a_wins=row["profit_a_wins"],
-            profit_b_wins=row["profit_b_wins"],
-            perdida_calificacion=row["perdida_calificacion"],
-            beneficio_cnr=row["beneficio_cnr"],
-            rendimiento_cnr=row["rendimiento_cnr"],
-            rating=row["rating"],
-            status=row["status"],
-            settled_at=datetime.fromisoformat(row["settled_at"]) if row["settled_at"] else None,
-            settlement_note=row["settlement_note"],
-            notes=row["notes"],
+            id=None,
+            ts=datetime.now(UTC),
+            origin_account_id=origin_account_id,
+            hedge_account_id=hedge_account_id,
+            event=event,
+            mode=mode,
+            stake_source=stake_source,
+            stake_a=stake_a,
+            odds_a=odds_a,
+            hedge_stake_b=calc.hedge_stake_b,
+            odds_b=odds_b,
+            exposure_b=calc.exposure_b,
+            commission_b=commission_b,
+            profit_a_wins=calc.profit_a_wins,
+            profit_b_wins=calc.profit_b_wins,
+            perdida_calificacion=calc.perdida_calificacion,
+            beneficio_cnr=calc.beneficio_cnr,
+            rendimiento_cnr=calc.rendimiento_cnr,
+            rating=calc.rating,
+            status="PENDIENTE",
         )
+
+    @staticmethod
+    def _operation_payload(operation: Operation) -> dict[str, Any]:
+        payload = asdict(operation)
+        payload.pop("id")
+        payload["ts"] = operation.ts.isoformat(timespec="seconds")
+        payload["settled_at"] = None
+        return payload
+
+    def _publish_after_commit(self, event: str, operation: Operation) -> None:
+        after_commit(lambda: self.bus.publish(event, operation))
+
+    def _fetch_operation(self, conn, operation_id: int) -> Operation:
+        rows = fetch_tuples(conn, f"{_OPERATION_SELECT} WHERE id=?", (operation_id,))
+        if not rows:
+            raise ValueError("Operation not found")
+        return self._row_to_operation(rows[0])
+
+    @staticmethod
+    def _row_to_operation(row: tuple) -> Operation:
+        values = list(row)
+        values[_TS] = parse_ts(values[_TS])
+        values[_SETTLED_AT] = parse_ts(values[_SETTLED_AT])
+        return Operation(*values)
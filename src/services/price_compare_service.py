@@ -3,51 +3,106 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterator, List
 
+import numpy as np
 import pandas as pd
 
 from ..domain.models import Opportunity
+from .calculator_service import CalculatorService
+
+# Feed columns in ``Opportunity`` field order, with their read dtypes.
+REQUIRED_COLUMNS = {
+    "provider_a": "string",
+    "provider_b": "string",
+    "mercado": "string",
+    "seleccion": "string",
+    "odds_a": "float64",
+    "odds_b": "float64",
+}
+OPTIONAL_DEFAULTS = {
+    "commission_b": 5.0,
+    "rating": 0.0,
+    "perdida_calificacion": 0.0,
+    "rendimiento_cnr": 0.0,
+    "beneficio_cnr": 0.0,
+}
+COLUMNS = [*REQUIRED_COLUMNS, *OPTIONAL_DEFAULTS]
+DTYPES = {**REQUIRED_COLUMNS, **{column: "float64" for column in OPTIONAL_DEFAULTS}}
+CHUNK_ROWS = 50_000
+REFERENCE_STAKE = 10.0
 
 
 class PriceCompareService:
+    """Load opportunity feeds, rated and ranked for a reference stake.
+
+    Rating, qualifying loss and CNR profit/yield are recomputed at ingest for
+    ``reference_stake``; rows the calculator rejects keep the feed's values.
+    """
+
+    def __init__(
+        self,
+        reference_stake: float = REFERENCE_STAKE,
+        calculator: CalculatorService | None = None,
+    ) -> None:
+        self.reference_stake = reference_stake
+        self.calculator = calculator or CalculatorService()
+
     def from_csv(self, path: Path) -> List[Opportunity]:
-        df = pd.read_csv(path)
-        return [self._row_to_opportunity(row) for _, row in df.iterrows()]
+        return self._frame_to_opportunities(self._read_csv(path))
+
+    def iter_csv(self, path: Path, chunksize: int = CHUNK_ROWS) -> Iterator[List[Opportunity]]:
+        """Stream a large feed as batches of at most ``chunksize`` opportunities."""
+        with self._read_csv(path, chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield self._frame_to_opportunities(chunk)
 
     def from_http_json(self, data: str) -> List[Opportunity]:
-        parsed = json.loads(data)
-        return [self._dict_to_opportunity(item) for item in parsed]
-
-    def _row_to_opportunity(self, row) -> Opportunity:
-        return Opportunity(
-            provider_a=row["provider_a"],
-            provider_b=row["provider_b"],
-            mercado=row["mercado"],
-            seleccion=row["seleccion"],
-            odds_a=float(row["odds_a"]),
-            odds_b=float(row["odds_b"]),
-            commission_b=float(row.get("commission_b", 5.0)),
-            rating=float(row.get("rating", 0.0)),
-            perdida_calificacion=float(row.get("perdida_calificacion", 0.0)),
-            rendimiento_cnr=float(row.get("rendimiento_cnr", 0.0)),
-            beneficio_cnr=float(row.get("beneficio_cnr", 0.0)),
-        )
-
-    def _dict_to_opportunity(self, data: dict) -> Opportunity:
-        return Opportunity(
-            provider_a=data["provider_a"],
-            provider_b=data["provider_b"],
-            mercado=data["mercado"],
-            seleccion=data["seleccion"],
-            odds_a=float(data["odds_a"]),
-            odds_b=float(data["odds_b"]),
-            commission_b=float(data.get("commission_b", 5.0)),
-            rating=float(data.get("rating", 0.0)),
-            perdida_calificacion=float(data.get("perdida_calificacion", 0.0)),
-            rendimiento_cnr=float(data.get("rendimiento_cnr", 0.0)),
-            beneficio_cnr=float(data.get("beneficio_cnr", 0.0)),
-        )
+        return self._frame_to_opportunities(pd.DataFrame.from_records(json.loads(data)))
+
+    @staticmethod
+    def _read_csv(path: Path, **kwargs):
+        # Unknown columns are skipped and known ones parsed straight into their types.
+        return pd.read_csv(path, usecols=lambda column: column in DTYPES, dtype=DTYPES, **kwargs)
+
+    def _frame_to_opportunities(self, frame: pd.DataFrame) -> List[Opportunity]:
+        if frame.empty:
+            return []
+        missing = [column for column in REQUIRED_COLUMNS if column not in frame.columns]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        frame = frame.reindex(columns=COLUMNS)
+        frame = frame.astype(DTYPES).fillna(OPTIONAL_DEFAULTS)
+        frame = self._rate(frame)
+        # Plain Python lists per column, zipped positionally into Opportunity fields.
+        columns = [frame[column].astype(object).tolist() for column in COLUMNS]
+        return [Opportunity(*values) for values in zip(*columns)]
+
+    def _rate(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Recompute the metrics of every valid row in two batch calls and sort by rating."""
+        odds_a = frame["odds_a"].to_numpy()
+        odds_b = frame["odds_b"].to_numpy()
+        commission = frame["commission_b"].to_numpy()
+        valid = (odds_a > 1.01) & (odds_b > 1.01) & (commission >= 0) & (commission <= 10)
+        if valid.any():
+            rows = np.flatnonzero(valid)
+            inputs = dict(
+                stake_a=self.reference_stake,
+                odds_a=odds_a[rows],
+                odds_b=odds_b[rows],
+                commission_b=commission[rows],
+            )
+            qualifying = self.calculator.compute_batch(**inputs, mode="calificacion")
+            cnr = self.calculator.compute_batch(**inputs, mode="credito_no_retorno")
+            frame = frame.copy()
+            for column, values in (
+                ("rating", qualifying.rating),
+                ("perdida_calificacion", qualifying.perdida_calificacion),
+                ("beneficio_cnr", cnr.beneficio_cnr),
+                ("rendimiento_cnr", cnr.rendimiento_cnr),
+            ):
+                frame.iloc[rows, frame.columns.get_loc(column)] = values
+        return frame.sort_values("rating", ascending=False, kind="stable")
 
 
 class ScraperSource:
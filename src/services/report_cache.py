@@ -0,0 +1,127 @@
+"""Report results cached until a domain event says they changed."""
+from __future__ import annotations
+
+import threading
+from datetime import date
+from typing import Any, Callable, Dict, List
+
+from ..domain.models import Operation, Transaction
+from ..utils.events import (
+    OPERATION_CANCELLED,
+    OPERATION_CREATED,
+    OPERATION_SETTLED,
+    OPERATION_UPDATED,
+    TRANSACTION_APPLIED,
+    EventBus,
+    get_global_bus,
+)
+from .report_service import PendingRiskReport, ProfitSeries, ReportService, day_bound
+
+_OPERATION_EVENTS = (OPERATION_CREATED, OPERATION_UPDATED, OPERATION_SETTLED, OPERATION_CANCELLED)
+
+
+class ReportCache:
+    """Memoise :class:`ReportService` reads and evict them from ``EventBus`` events.
+
+    KPIs depend on every balance and operation count, so any event drops them;
+    the pending risk report is dropped by every operation event.
+    Profit series only depend on ``op_settlement`` transactions and are only
+    dropped when a settlement lands inside their date range.
+    """
+
+    def __init__(self, service: ReportService | None = None, bus: EventBus | None = None) -> None:
+        self.service = service or ReportService()
+        self._entries: dict[tuple, Any] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.bus = bus or get_global_bus()
+        for event in _OPERATION_EVENTS:
+            self.bus.subscribe(event, self._on_operation_changed)
+        self.bus.subscribe(TRANSACTION_APPLIED, self._on_transaction_applied)
+
+    def close(self) -> None:
+        """Stop listening to the bus and drop every cached result."""
+        for event in _OPERATION_EVENTS:
+            self.bus.unsubscribe(event, self._on_operation_changed)
+        self.bus.unsubscribe(TRANSACTION_APPLIED, self._on_transaction_applied)
+        self.invalidate()
+
+    def kpis(self) -> Dict[str, float]:
+        return self._get(("kpis",), self.service.kpis)
+
+    def pending_risk(self) -> PendingRiskReport:
+        return self._get(("risk",), self.service.pending_risk)
+
+    def profit_over_time(
+        self,
+        period: str = "day",
+        *,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> List[tuple[str, float]]:
+        return self._get(
+            ("profit", period, start, end),
+            lambda: self.service.profit_over_time(period, start=start, end=end),
+        )
+
+    def profit_series(
+        self,
+        periods: tuple[str, ...] = ("day", "week", "month"),
+        *,
+        by_account: bool = False,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> ProfitSeries:
+        return self._get(
+            ("profit", ("series", tuple(periods), by_account), start, end),
+            lambda: self.service.profit_series(periods, by_account=by_account, start=start, end=end),
+        )
+
+    def cumulative_profit(
+        self,
+        max_points: int,
+        *,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> List[tuple[str, float]]:
+        return self._get(
+            ("profit", ("cumulative", max_points), start, end),
+            lambda: self.service.cumulative_profit(max_points, start=start, end=end),
+        )
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def _get(self, key: tuple, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+            generation = self._generation
+        value = loader()
+        with self._lock:
+            # Only keep the value if nothing was evicted while it was computed.
+            if generation == self._generation:
+                self._entries[key] = value
+        return value
+
+    def _evict(self, predicate: Callable[[tuple], bool]) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+            self._generation += 1
+
+    def _on_operation_changed(self, operation: Operation) -> None:
+        self._evict(lambda key: key[0] in ("kpis", "risk"))
+
+    def _on_transaction_applied(self, transaction: Transaction) -> None:
+        if transaction.kind != "op_settlement":
+            self._evict(lambda key: key[0] == "kpis")
+            return
+        day = day_bound(transaction.ts)
+        self._evict(lambda key: key[0] == "kpis" or (key[0] == "profit" and _covers(key[2], key[3], day)))
+
+
+def _covers(start: date | None, end: date | None, day: str) -> bool:
+    return (start is None or day_bound(start) <= day) and (end is None or day < day_bound(end))
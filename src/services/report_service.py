@@ -1,11 +1,119 @@
 """Reporting helpers for dashboards."""
 from __future__ import annotations
 
-from collections import defaultdict
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
 from typing import Dict, List
 
-from ..data.db import get_connection, initialise_database
+import numpy as np
+
+from ..data.db import fetch_tuples, get_connection, initialise_database
+from ..utils.downsample import lttb
+from ..utils.money import Money
+
+# SQL bucket expressions over a date/timestamp column named ``{col}``. The ISO
+# week belongs to the year of its Thursday, and its number is that Thursday's
+# day of the year divided into weeks.
+_ISO_THURSDAY = "date({col}, '-3 days', 'weekday 4')"
+PERIOD_BUCKETS = {
+    "day": "strftime('%Y-%m-%d', {col})",
+    "week": (
+        f"printf('%s-W%02d', strftime('%Y', {_ISO_THURSDAY}),"
+        f" (CAST(strftime('%j', {_ISO_THURSDAY}) AS INTEGER) - 1) / 7 + 1)"
+    ),
+    "month": "strftime('%Y-%m', {col})",
+}
+
+# Every query below reads only columns of the partial index ``idx_ops_pending``,
+# so settled history is never touched. The index is forced because the planner
+# would otherwise pick ``idx_ops_status_ts`` and visit the table for each row.
+_PENDING_BY_EVENT = """
+    SELECT event, COUNT(*),
+           SUM(CASE WHEN stake_source='efectivo' THEN stake_a ELSE 0 END),
+           SUM(exposure_b), SUM(profit_a_wins), SUM(profit_b_wins)
+    FROM operations INDEXED BY idx_ops_pending
+    WHERE status='PENDIENTE'
+    GROUP BY event
+    ORDER BY event
+"""
+_PENDING_BY_ACCOUNT = """
+    SELECT legs.account_id, a.name, a.owner, SUM(legs.n), SUM(legs.stake), SUM(legs.exposure)
+    FROM (
+        SELECT origin_account_id AS account_id, 1 AS n,
+               CASE WHEN stake_source='efectivo' THEN stake_a ELSE 0 END AS stake, 0 AS exposure
+        FROM operations INDEXED BY idx_ops_pending WHERE status='PENDIENTE'
+        UNION ALL
+        SELECT hedge_account_id, 1, 0, exposure_b
+        FROM operations INDEXED BY idx_ops_pending WHERE status='PENDIENTE'
+    ) AS legs
+    JOIN accounts a ON a.id = legs.account_id
+    GROUP BY legs.account_id
+    ORDER BY a.name
+"""
+
+
+@dataclass(slots=True)
+class ExposureLine:
+    """Cash locked by pending operations: cash-funded stakes plus hedge liabilities."""
+
+    key: str | int
+    operations: int
+    locked_stake: float
+    exposure: float
+
+    @property
+    def total_locked(self) -> float:
+        return float(Money.from_value(self.locked_stake) + Money.from_value(self.exposure))
+
+
+@dataclass(slots=True)
+class AccountExposure(ExposureLine):
+    """Pending exposure of one account, keyed by id; ``name`` is only a label."""
+
+    name: str = ""
+
+    @property
+    def account_id(self) -> int:
+        return self.key
+
+
+@dataclass(slots=True)
+class EventRisk(ExposureLine):
+    """Pending exposure of one event and its result if every operation on it settles A or B."""
+
+    profit_if_a: float = 0.0
+    profit_if_b: float = 0.0
+
+    @property
+    def worst_case(self) -> float:
+        return min(self.profit_if_a, self.profit_if_b)
+
+    @property
+    def best_case(self) -> float:
+        return max(self.profit_if_a, self.profit_if_b)
+
+
+@dataclass(slots=True)
+class PendingRiskReport:
+    by_account: List[AccountExposure] = field(default_factory=list)
+    by_owner: List[ExposureLine] = field(default_factory=list)
+    by_event: List[EventRisk] = field(default_factory=list)
+
+    @property
+    def total_locked(self) -> float:
+        return float(sum((Money.from_value(line.total_locked) for line in self.by_event), Money(0)))
+
+    @property
+    def worst_case(self) -> float:
+        return float(sum((Money.from_value(event.worst_case) for event in self.by_event), Money(0)))
+
+
+@dataclass(slots=True)
+class ProfitSeries:
+    """Settlement profit per bucket for several periods, optionally split by account."""
+
+    totals: Dict[str, List[tuple[str, float]]] = field(default_factory=dict)
+    by_account: Dict[str, Dict[int, List[tuple[str, float]]]] = field(default_factory=dict)
 
 
 class ReportService:
@@ -15,11 +123,12 @@ class ReportService:
     def kpis(self) -> Dict[str, float]:
         with get_connection() as conn:
             total_profit = conn.execute(
-                "SELECT COALESCE(SUM(CASE WHEN kind='op_settlement' THEN amount ELSE 0 END),0) FROM transactions"
+                "SELECT COALESCE(SUM(amount_sum),0) FROM rollup_tx_daily WHERE kind='op_settlement'"
             ).fetchone()[0]
-            operations_count = conn.execute("SELECT COUNT(*) FROM operations").fetchone()[0]
+            operations_count = conn.execute("SELECT COALESCE(SUM(op_count),0) FROM rollup_ops_daily").fetchone()[0]
             total_balance = conn.execute("SELECT COALESCE(SUM(balance),0) FROM accounts").fetchone()[0]
-        roi = total_profit / total_balance if total_balance else 0.0
+        total_profit, total_balance = Money.from_value(total_profit), Money.from_value(total_balance)
+        roi = total_profit.cents / total_balance.cents if total_balance.cents else 0.0
         return {
             "beneficio_total": float(total_profit),
             "roi": float(roi),
@@ -27,21 +136,162 @@ class ReportService:
             "saldo_total": float(total_balance),
         }
 
-    def profit_over_time(self, period: str = "day") -> List[tuple[str, float]]:
-        if period not in {"day", "week", "month"}:
+    def pending_risk(self) -> PendingRiskReport:
+        """Stake and exposure locked in ``PENDIENTE`` operations per account, owner and event."""
+        with get_connection() as conn:
+            event_rows = fetch_tuples(conn, _PENDING_BY_EVENT)
+            account_rows = fetch_tuples(conn, _PENDING_BY_ACCOUNT)
+        # SQL sums carry float noise; every amount is settled to cents here and
+        # owner totals are added up in cents.
+        report = PendingRiskReport(
+            by_event=[
+                EventRisk(event, count, *(float(Money.from_value(value)) for value in amounts))
+                for event, count, *amounts in event_rows
+            ]
+        )
+        owners: dict[str, tuple[int, Money, Money]] = {}
+        for account_id, name, owner, count, stake, exposure in account_rows:
+            stake, exposure = Money.from_value(stake), Money.from_value(exposure)
+            report.by_account.append(AccountExposure(account_id, count, float(stake), float(exposure), name))
+            operations, owner_stake, owner_exposure = owners.get(owner, (0, Money(0), Money(0)))
+            owners[owner] = (operations + count, owner_stake + stake, owner_exposure + exposure)
+        report.by_owner = [
+            ExposureLine(owner, operations, float(stake), float(exposure))
+            for owner, (operations, stake, exposure) in sorted(owners.items())
+        ]
+        return report
+
+    def profit_over_time(
+        self,
+        period: str = "day",
+        *,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> List[tuple[str, float]]:
+        """Settlement profit per day, ISO week or month, read from the daily rollup.
+
+        ``start`` is inclusive and ``end`` exclusive, both as UTC calendar days.
+        """
+        if period not in PERIOD_BUCKETS:
+            raise ValueError("Invalid period")
+        where, params = _day_range(start, end)
+        query = f"""
+            SELECT {PERIOD_BUCKETS[period].format(col="day")} AS bucket, SUM(amount_sum)
+            FROM rollup_tx_daily
+            WHERE {where}
+            GROUP BY bucket
+            ORDER BY bucket
+        """
+        with get_connection() as conn:
+            rows = fetch_tuples(conn, query, params)
+        return [(bucket, float(total)) for bucket, total in rows]
+
+    def profit_series(
+        self,
+        periods: tuple[str, ...] = ("day", "week", "month"),
+        *,
+        by_account: bool = False,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> ProfitSeries:
+        """Like :meth:`profit_over_time` for several periods from a single rollup read.
+
+        Buckets are derived in Python from the daily rows, so the cost depends
+        on the number of days and accounts, not on settlements or periods.
+        """
+        unknown = [period for period in periods if period not in PERIOD_BUCKETS]
+        if unknown:
             raise ValueError("Invalid period")
+        where, params = _day_range(start, end)
+        query = f"""
+            SELECT day, account_id, SUM(amount_sum)
+            FROM rollup_tx_daily
+            WHERE {where}
+            GROUP BY day, account_id
+            ORDER BY day
+        """
         with get_connection() as conn:
-            rows = conn.execute(
-                "SELECT ts, amount FROM transactions WHERE kind='op_settlement' ORDER BY ts"
-            ).fetchall()
-        buckets: Dict[str, float] = defaultdict(float)
-        for row in rows:
-            ts = datetime.fromisoformat(row["ts"])
-            if period == "day":
-                key = ts.strftime("%Y-%m-%d")
-            elif period == "week":
-                key = f"{ts.isocalendar().year}-W{ts.isocalendar().week:02d}"
-            else:
-                key = ts.strftime("%Y-%m")
-            buckets[key] += row["amount"]
-        return sorted(buckets.items())
+            rows = fetch_tuples(conn, query, params)
+
+        totals: dict[str, dict[str, float]] = {period: {} for period in periods}
+        accounts: dict[str, dict[int, dict[str, float]]] = {period: {} for period in periods}
+        labels: dict[str, list[str]] = {}
+        for day, account_id, amount in rows:
+            day_labels = labels.get(day)
+            if day_labels is None:
+                day_labels = labels[day] = [_bucket_label(day, period) for period in periods]
+            for period, label in zip(periods, day_labels):
+                buckets = totals[period]
+                buckets[label] = buckets.get(label, 0.0) + amount
+                if by_account:
+                    account = accounts[period].setdefault(account_id, {})
+                    account[label] = account.get(label, 0.0) + amount
+        # Days arrive in order and every label format sorts chronologically.
+        return ProfitSeries(
+            totals={period: list(buckets.items()) for period, buckets in totals.items()},
+            by_account={
+                period: {account_id: list(buckets.items()) for account_id, buckets in per_account.items()}
+                for period, per_account in accounts.items()
+            }
+            if by_account
+            else {},
+        )
+
+    def cumulative_profit(
+        self,
+        max_points: int,
+        *,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> List[tuple[str, float]]:
+        """Running settlement profit per day, downsampled with LTTB to ``max_points``.
+
+        Charts pass their pixel width so drawing cost does not grow with history.
+        """
+        where, params = _day_range(start, end)
+        query = f"""
+            SELECT day, SUM(amount_sum)
+            FROM rollup_tx_daily
+            WHERE {where}
+            GROUP BY day
+            ORDER BY day
+        """
+        with get_connection() as conn:
+            rows = fetch_tuples(conn, query, params)
+        if not rows:
+            return []
+        days = np.array([day for day, _ in rows], dtype="datetime64[D]")
+        totals = np.cumsum([total for _, total in rows], dtype=float)
+        x, y = lttb(days.astype(np.int64), totals, max(max_points, 3))
+        labels = x.astype(np.int64).astype("datetime64[D]").astype(str)
+        return [(label, float(value)) for label, value in zip(labels, y)]
+
+
+def day_bound(value: date) -> str:
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(UTC)
+        value = value.date()
+    return value.isoformat()
+
+
+def _bucket_label(day: str, period: str) -> str:
+    """Python twin of ``PERIOD_BUCKETS`` for an ISO ``YYYY-MM-DD`` day."""
+    if period == "day":
+        return day
+    if period == "month":
+        return day[:7]
+    year, week, _ = date.fromisoformat(day).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _day_range(start: date | None, end: date | None) -> tuple[str, list[str]]:
+    clauses = ["kind='op_settlement'"]
+    params: list[str] = []
+    if start is not None:
+        clauses.append("day >= ?")
+        params.append(day_bound(start))
+    if end is not None:
+        clauses.append("day < ?")
+        params.append(day_bound(end))
+    return " AND ".join(clauses), params
@@ -1,7 +1,9 @@
-"""Simple calculator form."""
+"""Calculator form with live recalculation and a loss/profit sensitivity heatmap."""
 from __future__ import annotations
 
-from PySide6.QtCore import Qt
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
 from PySide6.QtWidgets import (
     QComboBox,
     QFormLayout,
@@ -14,13 +16,52 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from ..services.calculator_service import CalculatorService
+from ..services.calculator_service import (
+    CalculationInputs,
+    CalculationOutput,
+    CalculatorService,
+    SensitivityGrid,
+)
+
+# Heatmap axes: ticks of odds B on each side of the entered price, and commissions.
+SENSITIVITY_TICKS = 10
+SENSITIVITY_COMMISSIONS = (0.0, 2.0, 3.0, 5.0, 6.5, 8.0, 10.0)
+# Quiet time after the last keystroke before recalculating.
+DEBOUNCE_MS = 250
+
+
+class _TaskSignals(QObject):
+    finished = Signal(int, object)
+    failed = Signal(int, str)
+
+
+class _CalculationTask(QRunnable):
+    """Runs one calculation on the thread pool and reports back tagged with its request id."""
+
+    def __init__(self, request_id: int, service: CalculatorService, inputs: CalculationInputs) -> None:
+        super().__init__()
+        self.request_id = request_id
+        self.service = service
+        self.inputs = inputs
+        self.signals = _TaskSignals()
+
+    def run(self) -> None:
+        try:
+            output = self.service.calculate(
+                self.inputs, ticks=SENSITIVITY_TICKS, commissions=SENSITIVITY_COMMISSIONS
+            )
+        except Exception as exc:  # pragma: no cover - UI feedback
+            self.signals.failed.emit(self.request_id, str(exc))
+            return
+        self.signals.finished.emit(self.request_id, output)
 
 
 class CalculatorView(QWidget):
     def __init__(self) -> None:
         super().__init__()
         self.service = CalculatorService()
+        self.pool = QThreadPool.globalInstance()
+        self._request_id = 0
         layout = QVBoxLayout(self)
         form = QFormLayout()
 
@@ -48,6 +89,7 @@ class CalculatorView(QWidget):
             "profit_a": QLabel("0.00"),
             "profit_b": QLabel("0.00"),
             "metric": QLabel("0.00"),
+            "ticks": QLabel(""),
         }
         grid.addWidget(QLabel("Cobertura B"), 0, 0)
         grid.addWidget(self.results_labels["hedge"], 0, 1)
@@ -59,19 +101,37 @@ class CalculatorView(QWidget):
         grid.addWidget(self.results_labels["profit_b"], 3, 1)
         grid.addWidget(QLabel("Métrica"), 4, 0)
         grid.addWidget(self.results_labels["metric"], 4, 1)
+        grid.addWidget(QLabel("Cuotas en tick (A / B)"), 5, 0)
+        grid.addWidget(self.results_labels["ticks"], 5, 1)
         self.result_box.setLayout(grid)
 
         self.calculate_button = QPushButton("Calcular")
         self.calculate_button.clicked.connect(self.calculate)
 
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(DEBOUNCE_MS)
+        self.debounce.timeout.connect(self.calculate)
+        for line_edit in (self.stake_input, self.odds_a_input, self.odds_b_input, self.comm_input):
+            line_edit.textChanged.connect(self.debounce.start)
+        for combo in (self.mode_input, self.source_input):
+            combo.currentIndexChanged.connect(self.debounce.start)
+
         layout.addLayout(form)
         layout.addWidget(self.calculate_button)
         layout.addWidget(self.result_box)
-        layout.addStretch(1)
+        self.figure = Figure(figsize=(6, 3.5), tight_layout=True)
+        self.canvas = FigureCanvasQTAgg(self.figure)
+        layout.addWidget(QLabel("Sensibilidad (cuota B × comisión)"))
+        layout.addWidget(self.canvas, 1)
+        self.calculate()
 
     def calculate(self) -> None:
+        """Queue a calculation of the current inputs; results of older requests are dropped."""
+        self.debounce.stop()
+        self._request_id += 1
         try:
-            result = self.service.compute(
+            inputs = CalculationInputs(
                 stake_a=float(self.stake_input.text()),
                 odds_a=float(self.odds_a_input.text()),
                 odds_b=float(self.odds_b_input.text()),
@@ -79,12 +139,43 @@ class CalculatorView(QWidget):
                 mode=self.mode_input.currentText(),
                 stake_source=self.source_input.currentText(),
             )
-        except Exception as exc:  # pragma: no cover - UI feedback
+        except ValueError as exc:  # pragma: no cover - UI feedback
             self.results_labels["metric"].setText(str(exc))
             return
+        task = _CalculationTask(self._request_id, self.service, inputs)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        self.pool.start(task)
+
+    def _on_finished(self, request_id: int, output: CalculationOutput) -> None:
+        if request_id != self._request_id:
+            return
+        result = output.result
         self.results_labels["hedge"].setText(f"{result.hedge_stake_b:.2f}")
         self.results_labels["exposure"].setText(f"{result.exposure_b:.2f}")
         self.results_labels["profit_a"].setText(f"{result.profit_a_wins:.2f}")
         self.results_labels["profit_b"].setText(f"{result.profit_b_wins:.2f}")
         metric_value = result.perdida_calificacion or result.beneficio_cnr or 0.0
         self.results_labels["metric"].setText(f"{metric_value:.2f}")
+        self.results_labels["ticks"].setText(f"{output.odds_a_tick} / {output.odds_b_tick}")
+        self._draw_heatmap(output.grid)
+
+    def _on_failed(self, request_id: int, message: str) -> None:
+        if request_id == self._request_id:
+            self.results_labels["metric"].setText(message)
+
+    def _draw_heatmap(self, grid: SensitivityGrid) -> None:
+        self.figure.clear()
+        axes = self.figure.add_subplot()
+        # A loss should read red as it grows; a CNR profit green.
+        cmap = "RdYlGn_r" if grid.mode == "calificacion" else "RdYlGn"
+        image = axes.imshow(grid.metric, aspect="auto", origin="lower", cmap=cmap)
+        axes.set_xticks(range(len(grid.commissions)), [f"{value:g}%" for value in grid.commissions])
+        step = max(1, len(grid.odds_b) // 10)
+        rows = range(0, len(grid.odds_b), step)
+        axes.set_yticks(list(rows), [f"{grid.odds_b[row]:g}" for row in rows])
+        axes.set_xlabel("Comisión B")
+        axes.set_ylabel("Cuota B")
+        label = "Pérdida" if grid.mode == "calificacion" else "Beneficio"
+        self.figure.colorbar(image, ax=axes, label=label)
+        self.canvas.draw_idle()
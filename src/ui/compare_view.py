@@ -35,5 +35,6 @@ class CompareView(QWidget):
         self.list_widget.clear()
         for op in opportunities:
             self.list_widget.addItem(
-                f"{op.provider_a}/{op.provider_b} {op.mercado} {op.odds_a:.2f}-{op.odds_b:.2f}"
+                f"{op.rating:.2f}% {op.provider_a}/{op.provider_b} {op.mercado} {op.odds_a:.2f}-{op.odds_b:.2f}"
+                f" · pérdida {op.perdida_calificacion:.2f} · CNR {op.beneficio_cnr:.2f}"
             )
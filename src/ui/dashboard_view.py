@@ -1,23 +1,71 @@
-"""Dashboard view summarising KPIs."""
+"""Dashboard view summarising KPIs, pending risk and cumulative profit."""
 from __future__ import annotations
 
+from datetime import date
+
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
 from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
 
-from ..services.report_service import ReportService
+from ..services.report_cache import ReportCache
+
+# Widths are rounded to this step so small resizes reuse the cached series.
+WIDTH_STEP = 100
 
 
 class DashboardView(QWidget):
     def __init__(self) -> None:
         super().__init__()
-        self.service = ReportService()
+        self.service = ReportCache()
+        self.destroyed.connect(self.service.close)
         layout = QVBoxLayout(self)
         self.label = QLabel()
         layout.addWidget(QLabel("Indicadores clave"))
         layout.addWidget(self.label)
-        layout.addStretch(1)
+        self.risk_label = QLabel()
+        layout.addWidget(QLabel("Riesgo pendiente"))
+        layout.addWidget(self.risk_label)
+        layout.addWidget(QLabel("Beneficio acumulado"))
+        self.figure = Figure(figsize=(6, 3), tight_layout=True)
+        self.canvas = FigureCanvasQTAgg(self.figure)
+        self.axes = self.figure.add_subplot()
+        layout.addWidget(self.canvas, 1)
+        self._plotted_points = 0
         self.refresh()
 
     def refresh(self) -> None:
         kpis = self.service.kpis()
         text = "\n".join(f"{key}: {value:.2f}" for key, value in kpis.items())
         self.label.setText(text)
+        risk = self.service.pending_risk()
+        lines = [f"Bloqueado: {risk.total_locked:.2f} · Peor caso: {risk.worst_case:.2f}"]
+        lines += [
+            f"{event.key}: {event.total_locked:.2f} bloqueado, {event.worst_case:.2f} / {event.best_case:.2f}"
+            for event in risk.by_event
+        ]
+        self.risk_label.setText("\n".join(lines))
+        self._plot_profit()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        if self._chart_points() != self._plotted_points:
+            self._plot_profit()
+
+    def _chart_points(self) -> int:
+        width = max(self.canvas.width(), WIDTH_STEP)
+        return -(-width // WIDTH_STEP) * WIDTH_STEP
+
+    def _plot_profit(self) -> None:
+        # The service downsamples to about one point per pixel column.
+        points = self._chart_points()
+        series = self.service.cumulative_profit(points)
+        self._plotted_points = points
+        self.axes.clear()
+        if series:
+            days = [date.fromisoformat(day) for day, _ in series]
+            self.axes.plot(days, [value for _, value in series], linewidth=1.2)
+            self.axes.axhline(0, color="grey", linewidth=0.6)
+        else:
+            self.axes.text(0.5, 0.5, "Sin liquidaciones", ha="center", va="center", transform=self.axes.transAxes)
+        self.figure.autofmt_xdate()
+        self.canvas.draw_idle()
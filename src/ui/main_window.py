@@ -58,3 +58,5 @@ class MainWindow(QMainWindow):
 
     def _change_view(self, index: int) -> None:
         self.stack.setCurrentIndex(index)
+        if isinstance(self.stack.currentWidget(), DashboardView):
+            self.stack.currentWidget().refresh()
@@ -0,0 +1,184 @@
+"""Lazily fetched table model over paginated operation queries."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from ..domain.models import Operation
+from ..services.operation_service import OperationService
+
+# (header, operations column used for sorting; None if the header cannot sort)
+# Account columns show names but store ids, so ordering them in SQL would not
+# match what the user sees.
+COLUMNS = [
+    ("ID", "id"),
+    ("Fecha", "ts"),
+    ("Evento", "event"),
+    ("Cuenta origen", None),
+    ("Cobertura", None),
+    ("Stake A", "stake_a"),
+    ("Cobertura B", "hedge_stake_b"),
+    ("Estado", "status"),
+]
+
+
+class OperationsTableModel(QAbstractTableModel):
+    """Operations table that only holds the pages the view has scrolled to.
+
+    Rows are fetched one page at a time through ``canFetchMore``/``fetchMore``;
+    sorting and filtering are pushed down to SQL and restart from page one.
+    """
+
+    def __init__(
+        self,
+        service: OperationService,
+        account_lookup: dict[int, str],
+        *,
+        page_size: int = 200,
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self.service = service
+        self.account_lookup = account_lookup
+        self.page_size = page_size
+        self.filters: dict[str, Any] = {"include_cancelled": False}
+        self.order_by = "ts"
+        self.descending = True
+        self._operations: list[Operation] = []
+        self._row_by_id: dict[int, int] = {}
+        self._cursor: tuple[Any, int] | None = None
+        self._exhausted = False
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._operations)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section][0]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        operation = self._operations[index.row()]
+        if role == Qt.DisplayRole:
+            return self._display(operation, index.column())
+        if role == Qt.UserRole:
+            return operation.id
+        if role == Qt.TextAlignmentRole and index.column() in (5, 6):
+            return Qt.AlignRight | Qt.AlignVCenter
+        return None
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if parent.isValid() or self._exhausted:
+            return
+        page = self.service.query_operations(
+            **self.filters,
+            order_by=self.order_by,
+            descending=self.descending,
+            after=self._cursor,
+            limit=self.page_size,
+        )
+        self._cursor = page.next_cursor
+        self._exhausted = page.next_cursor is None
+        if not page.items:
+            return
+        first = len(self._operations)
+        self.beginInsertRows(QModelIndex(), first, first + len(page.items) - 1)
+        for offset, operation in enumerate(page.items):
+            self._row_by_id[operation.id] = first + offset
+        self._operations.extend(page.items)
+        self.endInsertRows()
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder) -> None:
+        order_by = COLUMNS[column][1]
+        if order_by is None:
+            return
+        self.order_by = order_by
+        self.descending = order == Qt.DescendingOrder
+        self.reload()
+
+    def sort_column(self) -> int:
+        """Column whose header matches the current ordering."""
+        return next(index for index, (_, column) in enumerate(COLUMNS) if column == self.order_by)
+
+    @staticmethod
+    def is_sortable(column: int) -> bool:
+        return COLUMNS[column][1] is not None
+
+    def set_filters(self, **filters: Any) -> None:
+        self.filters = {key: value for key, value in filters.items() if value is not None}
+        self.filters.setdefault("include_cancelled", False)
+        self.reload()
+
+    def reload(self) -> None:
+        self.beginResetModel()
+        self._operations = []
+        self._row_by_id = {}
+        self._cursor = None
+        self._exhausted = False
+        self.endResetModel()
+        self.fetchMore()
+
+    def operation_at(self, row: int) -> Operation | None:
+        if 0 <= row < len(self._operations):
+            return self._operations[row]
+        return None
+
+    def update_operation(self, operation: Operation) -> None:
+        """Refresh one loaded row in place, dropping it if it no longer matches the filters."""
+        row = self._row_by_id.get(operation.id)
+        if row is None:
+            return
+        if not self._matches(operation):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._operations[row]
+            self._row_by_id = {op.id: position for position, op in enumerate(self._operations)}
+            self.endRemoveRows()
+            return
+        self._operations[row] = operation
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+
+    def _matches(self, operation: Operation) -> bool:
+        filters = self.filters
+        if not filters.get("include_cancelled", True) and operation.status == "CANCELADA":
+            return False
+        status = filters.get("status")
+        if status is not None and operation.status not in ({status} if isinstance(status, str) else set(status)):
+            return False
+        account_id = filters.get("account_id")
+        if account_id is not None and account_id not in (operation.origin_account_id, operation.hedge_account_id):
+            return False
+        for key in ("mode", "event"):
+            if key in filters and getattr(operation, key) != filters[key]:
+                return False
+        return True
+
+    def _display(self, operation: Operation, column: int) -> str:
+        if column == 0:
+            return str(operation.id)
+        if column == 1:
+            return self._format_ts(operation.ts)
+        if column == 2:
+            return operation.event
+        if column == 3:
+            return self.account_lookup.get(operation.origin_account_id, "")
+        if column == 4:
+            return self.account_lookup.get(operation.hedge_account_id, "")
+        if column == 5:
+            return f"{operation.stake_a:.2f}"
+        if column == 6:
+            return f"{operation.hedge_stake_b:.2f}"
+        return operation.status
+
+    @staticmethod
+    def _format_ts(ts: datetime) -> str:
+        return ts.strftime("%Y-%m-%d %H:%M")
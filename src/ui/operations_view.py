@@ -1,9 +1,9 @@
 """Operations management view allowing basic CRUD."""
 from __future__ import annotations
 
-from datetime import datetime
-
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
+    QAbstractItemView,
     QComboBox,
     QFormLayout,
     QGroupBox,
@@ -11,14 +11,14 @@ from PySide6.QtWidgets import (
     QLabel,
     QLineEdit,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
 from ..services.account_service import AccountService
 from ..services.operation_service import OperationService
+from .operations_model import OperationsTableModel
 
 
 class OperationsView(QWidget):
@@ -71,23 +71,33 @@ class OperationsView(QWidget):
         buttons_layout.addWidget(self.create_button)
         buttons_layout.addStretch(1)
 
-        self.table = QTableWidget(0, 8)
-        self.table.setHorizontalHeaderLabels(
-            [
-                "ID",
-                "Fecha",
-                "Evento",
-                "Cuenta origen",
-                "Cobertura",
-                "Stake A",
-                "Cobertura B",
-                "Estado",
-            ]
-        )
+        filters_layout = QHBoxLayout()
+        self.status_filter = QComboBox()
+        self.status_filter.addItem("Todos los estados", None)
+        for status in ["PENDIENTE", "GANA_A", "GANA_B", "ANULADA"]:
+            self.status_filter.addItem(status, status)
+        self.mode_filter = QComboBox()
+        self.mode_filter.addItem("Todos los modos", None)
+        for mode in ["calificacion", "credito_no_retorno"]:
+            self.mode_filter.addItem(mode, mode)
+        self.account_filter = QComboBox()
+        for combo in (self.status_filter, self.mode_filter, self.account_filter):
+            combo.currentIndexChanged.connect(self._apply_filters)
+            filters_layout.addWidget(combo)
+        filters_layout.addStretch(1)
+
+        self.model = OperationsTableModel(self.service, self.account_lookup, parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setStretchLastSection(True)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        # Setting the indicator first makes enabling sorting the only initial load.
+        header = self.table.horizontalHeader()
+        header.setSortIndicator(1, Qt.DescendingOrder)
+        header.sortIndicatorChanged.connect(self._keep_sort_indicator)
+        self.table.setSortingEnabled(True)
 
         table_actions = QHBoxLayout()
         self.edit_button = QPushButton("Editar seleccionada")
@@ -107,12 +117,13 @@ class OperationsView(QWidget):
         layout.addWidget(form_group)
         layout.addLayout(buttons_layout)
         layout.addWidget(self.message_label)
+        layout.addLayout(filters_layout)
         layout.addWidget(self.table)
         layout.addLayout(table_actions)
         layout.addStretch(1)
 
         self._load_accounts()
-        self._refresh_table()
+        self._refresh_button_label()
 
     def _load_accounts(self) -> None:
         self.account_lookup.clear()
@@ -134,6 +145,31 @@ class OperationsView(QWidget):
         if self.hedge_combo.count() == 0:
             self.hedge_combo.addItem("No hay cuentas de cobertura", -1)
 
+        self.account_filter.blockSignals(True)
+        self.account_filter.clear()
+        self.account_filter.addItem("Todas las cuentas", None)
+        for account_id, name in self.account_lookup.items():
+            self.account_filter.addItem(name, account_id)
+        self.account_filter.blockSignals(False)
+
+    def _keep_sort_indicator(self, column: int, _order: Qt.SortOrder) -> None:
+        if self.model.is_sortable(column):
+            return
+        header = self.table.horizontalHeader()
+        header.blockSignals(True)
+        header.setSortIndicator(
+            self.model.sort_column(),
+            Qt.DescendingOrder if self.model.descending else Qt.AscendingOrder,
+        )
+        header.blockSignals(False)
+
+    def _apply_filters(self) -> None:
+        self.model.set_filters(
+            status=self.status_filter.currentData(),
+            mode=self.mode_filter.currentData(),
+            account_id=self.account_filter.currentData(),
+        )
+
     def _create_operation(self) -> None:
         if self.edit_operation_id is not None:
             self._update_operation()
@@ -162,7 +198,7 @@ class OperationsView(QWidget):
             return
 
         self._set_message(f"Operación {operation.id} creada correctamente")
-        self._refresh_table()
+        self.model.reload()
         self._reset_form()
 
     def _update_operation(self) -> None:
@@ -192,40 +228,28 @@ class OperationsView(QWidget):
             self._set_message(str(exc), error=True)
             return
         self._set_message(f"Operación {operation.id} actualizada")
-        self._refresh_table()
+        self.model.update_operation(operation)
         self._reset_form()
 
     def _cancel_selected(self) -> None:
         self._set_message("")
-        selected = self.table.currentRow()
-        if selected < 0:
-            self._set_message("Seleccione una operación", error=True)
+        operation_id = self._selected_operation_id()
+        if operation_id is None:
             return
-        operation_id_item = self.table.item(selected, 0)
-        if not operation_id_item:
-            self._set_message("No se pudo identificar la operación", error=True)
-            return
-        operation_id = int(operation_id_item.text())
         try:
-            self.service.cancel_operation(operation_id, note="Cancelada desde UI")
+            operation = self.service.cancel_operation(operation_id, note="Cancelada desde UI")
         except Exception as exc:  # pragma: no cover - UI feedback
             self._set_message(str(exc), error=True)
             return
         self._set_message(f"Operación {operation_id} eliminada")
-        self._refresh_table()
+        self.model.update_operation(operation)
         self._reset_form()
 
     def _load_selected_for_edit(self) -> None:
         self._set_message("")
-        selected = self.table.currentRow()
-        if selected < 0:
-            self._set_message("Seleccione una operación", error=True)
+        operation_id = self._selected_operation_id()
+        if operation_id is None:
             return
-        operation_id_item = self.table.item(selected, 0)
-        if not operation_id_item:
-            self._set_message("No se pudo identificar la operación", error=True)
-            return
-        operation_id = int(operation_id_item.text())
         try:
             operation = self.service.get_operation(operation_id)
         except Exception as exc:  # pragma: no cover - UI feedback
@@ -249,37 +273,26 @@ class OperationsView(QWidget):
 
     def _settle_selected(self, outcome: str) -> None:
         self._set_message("")
-        selected = self.table.currentRow()
-        if selected < 0:
-            self._set_message("Seleccione una operación", error=True)
+        operation_id = self._selected_operation_id()
+        if operation_id is None:
             return
-        operation_id_item = self.table.item(selected, 0)
-        if not operation_id_item:
-            self._set_message("No se pudo identificar la operación", error=True)
-            return
-        operation_id = int(operation_id_item.text())
         try:
             operation = self.service.settle_operation(operation_id, outcome, note="Resultado registrado desde UI")
         except Exception as exc:  # pragma: no cover - UI feedback
             self._set_message(str(exc), error=True)
             return
         self._set_message(f"Resultado registrado para la operación {operation.id}")
-        self._refresh_table()
+        self.model.update_operation(operation)
         self._reset_form()
 
-    def _refresh_table(self) -> None:
-        operations = [op for op in self.service.list_operations(include_cancelled=False)]
-        self.table.setRowCount(len(operations))
-        for row, operation in enumerate(operations):
-            self.table.setItem(row, 0, QTableWidgetItem(str(operation.id)))
-            self.table.setItem(row, 1, QTableWidgetItem(self._format_ts(operation.ts)))
-            self.table.setItem(row, 2, QTableWidgetItem(operation.event))
-            self.table.setItem(row, 3, QTableWidgetItem(self.account_lookup.get(operation.origin_account_id, "")))
-            self.table.setItem(row, 4, QTableWidgetItem(self.account_lookup.get(operation.hedge_account_id, "")))
-            self.table.setItem(row, 5, QTableWidgetItem(f"{operation.stake_a:.2f}"))
-            self.table.setItem(row, 6, QTableWidgetItem(f"{operation.hedge_stake_b:.2f}"))
-            self.table.setItem(row, 7, QTableWidgetItem(operation.status))
-        self.table.resizeColumnsToContents()
+    def _selected_operation_id(self) -> int | None:
+        operation = self.model.operation_at(self.table.currentIndex().row())
+        if operation is None:
+            self._set_message("Seleccione una operación", error=True)
+            return None
+        return operation.id
+
+    def _refresh_button_label(self) -> None:
         if self.edit_operation_id is not None:
             self.create_button.setText("Guardar cambios")
         else:
@@ -305,7 +318,3 @@ class OperationsView(QWidget):
             combo.addItem(name, value)
             index = combo.count() - 1
         combo.setCurrentIndex(index)
-
-    @staticmethod
-    def _format_ts(ts: datetime) -> str:
-        return ts.strftime("%Y-%m-%d %H:%M")
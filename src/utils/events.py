@@ -6,6 +6,13 @@ from typing import Callable, DefaultDict, List
 
 Listener = Callable[..., None]
 
+# Domain events published by the services once their changes are committed.
+OPERATION_CREATED = "operation.created"
+OPERATION_UPDATED = "operation.updated"
+OPERATION_SETTLED = "operation.settled"
+OPERATION_CANCELLED = "operation.cancelled"
+TRANSACTION_APPLIED = "transaction.applied"
+
 
 class EventBus:
     def __init__(self) -> None:
@@ -14,6 +21,11 @@ class EventBus:
     def subscribe(self, event: str, listener: Listener) -> None:
         self._listeners[event].append(listener)
 
+    def unsubscribe(self, event: str, listener: Listener) -> None:
+        listeners = self._listeners.get(event, [])
+        if listener in listeners:
+            listeners.remove(listener)
+
     def publish(self, event: str, *args, **kwargs) -> None:
         for listener in list(self._listeners.get(event, [])):
             listener(*args, **kwargs)
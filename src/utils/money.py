@@ -0,0 +1,97 @@
+"""Fixed-point money arithmetic on integer cents and scaled-integer odds.
+
+Amounts and odds with at most two decimals are represented exactly as
+integers scaled by 100, so the calculator's round-up and half-up rules become
+integer divisions. The division helpers are duck-typed and work the same on
+Python ints and NumPy integer arrays. Values that do not sit on the grid are
+left to the ``Decimal`` helpers in :mod:`src.utils.rounding`.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import Decimal
+
+from .rounding import round_half_up, round_up, to_decimal
+
+
+def scaled(value: float | int | Decimal | str, places: int = 2) -> int | None:
+    """``value * 10**places`` as an exact int, or ``None`` if it has more decimals.
+
+    A float equal to ``n / 10**places`` prints as that decimal, so the result
+    agrees with ``Decimal(str(value))``.
+    """
+    factor = 10**places
+    if isinstance(value, bool):
+        raise TypeError("Amounts cannot be booleans")
+    if isinstance(value, int):
+        return value * factor
+    if isinstance(value, float):
+        n = round(value * factor)
+        return n if n / factor == value else None
+    exact = to_decimal(value) * factor
+    return int(exact) if exact == exact.to_integral_value() else None
+
+
+def ceil_div(numerator, denominator):
+    """Division rounded towards +inf, for positive denominators."""
+    return -(-numerator // denominator)
+
+
+def half_up_div(numerator, denominator):
+    """Division rounded half away from zero, for positive denominators."""
+    magnitude = (2 * abs(numerator) + denominator) // (2 * denominator)
+    return magnitude * (1 - 2 * (numerator < 0))
+
+
+def from_scaled(value: int, places: int = 2) -> float:
+    """Nearest float to ``value / 10**places``."""
+    return value / 10**places
+
+
+@dataclass(frozen=True, slots=True, order=True)
+class Money:
+    """An amount in whole cents."""
+
+    cents: int
+
+    @classmethod
+    def from_value(cls, value: float | int | Decimal | str, rounding: str = "half_up") -> Money:
+        """Round ``value`` to cents with the same rules as :func:`~src.utils.rounding.as_float`."""
+        exact = scaled(value)
+        if exact is not None:
+            return cls(exact)
+        rounded = round_up(value) if rounding == "up" else round_half_up(value)
+        return cls(int(rounded * 100))
+
+    def __add__(self, other: Money) -> Money:
+        return Money(self.cents + other.cents)
+
+    def __sub__(self, other: Money) -> Money:
+        return Money(self.cents - other.cents)
+
+    def __neg__(self) -> Money:
+        return Money(-self.cents)
+
+    def __float__(self) -> float:
+        return from_scaled(self.cents)
+
+    def __str__(self) -> str:
+        sign = "-" if self.cents < 0 else ""
+        whole, cents = divmod(abs(self.cents), 100)
+        return f"{sign}{whole}.{cents:02d}"
+
+
+def odds_profit(stake: float, odds: float) -> float:
+    """``stake * (odds - 1)`` without binary floating-point error when both are on the grid."""
+    stake_cents, odds_scaled = scaled(stake), scaled(odds)
+    if stake_cents is None or odds_scaled is None:
+        return stake * (odds - 1)
+    return from_scaled(stake_cents * (odds_scaled - 100), 4)
+
+
+def net_of_commission(amount: float, commission: float) -> float:
+    """``amount * (1 - commission / 100)`` without binary floating-point error on the grid."""
+    amount_cents, commission_scaled = scaled(amount), scaled(commission)
+    if amount_cents is None or commission_scaled is None:
+        return amount * (1 - commission / 100)
+    return from_scaled(amount_cents * (10_000 - commission_scaled), 6)
@@ -2,9 +2,16 @@
 from __future__ import annotations
 
 from decimal import Decimal, ROUND_HALF_UP, ROUND_UP, getcontext
+from functools import lru_cache
 
 getcontext().prec = 28
 
+
+@lru_cache(maxsize=None)
+def _quantum(ndigits: int) -> Decimal:
+    return Decimal(f"1.{'0' * ndigits}")
+
+
 def to_decimal(value: float | int | str) -> Decimal:
     """Convert a numeric value to Decimal safely."""
     if isinstance(value, Decimal):
@@ -13,16 +20,19 @@ def to_decimal(value: float | int | str) -> Decimal:
 
 
 def round_half_up(value: Decimal | float | int, ndigits: int = 2) -> Decimal:
-    quantize_exp = Decimal(f"1.{'0' * ndigits}")
-    return to_decimal(value).quantize(quantize_exp, rounding=ROUND_HALF_UP)
+    return to_decimal(value).quantize(_quantum(ndigits), rounding=ROUND_HALF_UP)
 
 
 def round_up(value: Decimal | float | int, ndigits: int = 2) -> Decimal:
-    quantize_exp = Decimal(f"1.{'0' * ndigits}")
-    return to_decimal(value).quantize(quantize_exp, rounding=ROUND_UP)
+    return to_decimal(value).quantize(_quantum(ndigits), rounding=ROUND_UP)
 
 
 def as_float(value: Decimal | float | int, ndigits: int = 2, rounding: str = 'half_up') -> float:
+    if type(value) is float:
+        # Already on the grid: both rounding modes leave it unchanged.
+        factor = 10**ndigits
+        if round(value * factor) / factor == value:
+            return value
     decimal_value = to_decimal(value)
     if rounding == 'up':
         decimal_value = round_up(decimal_value, ndigits)
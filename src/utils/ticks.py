@@ -0,0 +1,146 @@
+"""Exchange tick ladders with precomputed prices and bisect lookups."""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable
+
+import numpy as np
+
+from .rounding import to_decimal
+
+
+@dataclass
+class TickSizeBand:
+    min_value: Decimal
+    max_value: Decimal
+    tick: Decimal
+
+    def contains(self, odds: Decimal) -> bool:
+        return self.min_value <= odds <= self.max_value
+
+
+def default_tick_bands() -> list[TickSizeBand]:
+    return [
+        TickSizeBand(Decimal("1.01"), Decimal("2.0"), Decimal("0.01")),
+        TickSizeBand(Decimal("2.0"), Decimal("3.0"), Decimal("0.02")),
+        TickSizeBand(Decimal("3.0"), Decimal("4.0"), Decimal("0.05")),
+        TickSizeBand(Decimal("4.0"), Decimal("6.0"), Decimal("0.1")),
+        TickSizeBand(Decimal("6.0"), Decimal("10.0"), Decimal("0.2")),
+        TickSizeBand(Decimal("10.0"), Decimal("20.0"), Decimal("0.5")),
+        TickSizeBand(Decimal("20.0"), Decimal("30.0"), Decimal("1.0")),
+        TickSizeBand(Decimal("30.0"), Decimal("50.0"), Decimal("2.0")),
+        TickSizeBand(Decimal("50.0"), Decimal("100.0"), Decimal("5.0")),
+    ]
+
+
+class TickLadder:
+    """Every legal price of a set of tick bands, sorted, as ``Decimal`` and float.
+
+    A price shared by two bands keeps the representation of the first band,
+    matching the band scan in ``validate_and_round_to_tick``. Float lookups
+    bisect the float ladder, which orders exactly like the ``Decimal`` one
+    because each float is the nearest double to its price.
+    """
+
+    def __init__(self, bands: Iterable[TickSizeBand]) -> None:
+        prices: list[Decimal] = []
+        for band in bands:
+            price = band.min_value
+            while price <= band.max_value:
+                if not prices or price > prices[-1]:
+                    prices.append(price.quantize(band.tick))
+                price += band.tick
+        if not prices:
+            raise ValueError("A tick ladder needs at least one price")
+        self.prices = prices
+        self.floats = [float(price) for price in prices]
+        self.array = np.array(self.floats)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @property
+    def min_price(self) -> Decimal:
+        return self.prices[0]
+
+    @property
+    def max_price(self) -> Decimal:
+        return self.prices[-1]
+
+    def snap_up(self, odds: float | Decimal) -> Decimal:
+        """Smallest ladder price greater than or equal to ``odds``."""
+        return self._at(bisect_left(self._keys(odds), self._key(odds)))
+
+    def snap_down(self, odds: float | Decimal) -> Decimal:
+        """Largest ladder price less than or equal to ``odds``."""
+        return self._at(bisect_right(self._keys(odds), self._key(odds)) - 1)
+
+    def next_tick(self, odds: float | Decimal) -> Decimal:
+        """Smallest ladder price strictly above ``odds``."""
+        return self._at(bisect_right(self._keys(odds), self._key(odds)))
+
+    def previous_tick(self, odds: float | Decimal) -> Decimal:
+        """Largest ladder price strictly below ``odds``."""
+        return self._at(bisect_left(self._keys(odds), self._key(odds)) - 1)
+
+    def shift(self, odds: float | Decimal, ticks: int) -> Decimal:
+        """The price ``ticks`` steps away from ``odds`` snapped up, clamped to the ladder."""
+        position = bisect_left(self._keys(odds), self._key(odds)) + ticks
+        return self.prices[min(max(position, 0), len(self.prices) - 1)]
+
+    def between(self, low: float | Decimal, high: float | Decimal) -> list[Decimal]:
+        """Ladder prices from ``low`` to ``high``, both inclusive."""
+        start = bisect_left(self._keys(low), self._key(low))
+        end = bisect_right(self._keys(high), self._key(high))
+        return self.prices[start:end]
+
+    def snap_array(self, odds, direction: str = "up") -> np.ndarray:
+        """Vectorised snap of a whole array of odds; prices off the ladder become NaN."""
+        values = np.asarray(odds, dtype=float)
+        if direction == "up":
+            positions = np.searchsorted(self.array, values, side="left")
+        elif direction == "down":
+            positions = np.searchsorted(self.array, values, side="right") - 1
+        else:
+            raise ValueError("direction must be 'up' or 'down'")
+        valid = (positions >= 0) & (positions < len(self.array))
+        snapped = self.array[np.clip(positions, 0, len(self.array) - 1)]
+        return np.where(valid & ~np.isnan(values), snapped, np.nan)
+
+    def _keys(self, odds: float | Decimal) -> list:
+        return self.floats if isinstance(odds, (float, int)) else self.prices
+
+    @staticmethod
+    def _key(odds: float | Decimal) -> float | Decimal:
+        return odds if isinstance(odds, (float, int)) else to_decimal(odds)
+
+    def _at(self, position: int) -> Decimal:
+        if not 0 <= position < len(self.prices):
+            raise ValueError("Odds outside the tick ladder")
+        return self.prices[position]
+
+
+_ladders: dict[str, TickLadder] = {}
+_ladders_lock = threading.Lock()
+
+
+def register_ladder(name: str, ladder: TickLadder | Iterable[TickSizeBand]) -> TickLadder:
+    """Register (or replace) a named ladder, e.g. for another exchange's tick table."""
+    if not isinstance(ladder, TickLadder):
+        ladder = TickLadder(ladder)
+    with _ladders_lock:
+        _ladders[name] = ladder
+    return ladder
+
+
+def get_ladder(name: str = "default") -> TickLadder:
+    ladder = _ladders.get(name)
+    if ladder is not None:
+        return ladder
+    if name != "default":
+        raise KeyError(f"Unknown tick ladder {name!r}")
+    with _ladders_lock:
+        return _ladders.setdefault("default", TickLadder(default_tick_bands()))
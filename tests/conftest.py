@@ -4,3 +4,40 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from src.data.db import close_connections
+from src.domain.models import Account
+from src.services.account_service import AccountService
+from src.services.calculator_service import get_global_cache
+from src.services.operation_service import OperationService
+
+
+@pytest.fixture(autouse=True)
+def _close_pooled_connections():
+    yield
+    close_connections()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_calculator_cache():
+    get_global_cache().clear()
+    yield
+
+
+@pytest.fixture
+def services(tmp_path, monkeypatch):
+    """Account and operation services on a fresh database with a funded origin and exchange account."""
+    db_path = tmp_path / "test.sqlite"
+    monkeypatch.setattr("src.data.db.get_db_path", lambda: db_path)
+    account_service = AccountService()
+    origin = account_service.create_account(
+        Account(id=None, name="Origen", owner="Alice", type="origen", balance=0.0)
+    )
+    hedge = account_service.create_account(
+        Account(id=None, name="Exchange", owner="Casa", type="contraposicion", commission=5.0, balance=0.0)
+    )
+    account_service.apply_transaction(account_id=origin.id, kind="deposit", amount=200.0)
+    account_service.apply_transaction(account_id=hedge.id, kind="deposit", amount=400.0)
+    return account_service, OperationService(account_service)
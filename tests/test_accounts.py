@@ -1,5 +1,8 @@
+import pytest
+
+from src.data.db import get_connection
 from src.domain.models import Account
-from src.services.account_service import AccountService
+from src.services.account_service import _RECONCILE_ALL, AccountService
 
 
 def test_create_account_and_transaction(tmp_path, monkeypatch):
@@ -23,3 +26,55 @@ def test_create_account_and_transaction(tmp_path, monkeypatch):
     assert accounts[0].bonus_balance == 25.0
 
     assert service.reconcile_account(account.id)
+
+
+def test_reconcile_uses_and_advances_checkpoint(tmp_path, monkeypatch):
+    db_path = tmp_path / "test.sqlite"
+    monkeypatch.setattr("src.data.db.get_db_path", lambda: db_path)
+    service = AccountService()
+    account = service.create_account(Account(id=None, name="Test", owner="Alice", type="origen"))
+
+    service.apply_transaction(account_id=account.id, kind="deposit", amount=100.0)
+    assert service.reconcile_account(account.id)
+    tx = service.apply_transaction(account_id=account.id, kind="withdrawal", amount=-40.0)
+    assert service.reconcile_account(account.id)
+
+    with get_connection() as conn:
+        checkpoint = conn.execute(
+            "SELECT last_tx_id, balance FROM balance_checkpoints WHERE account_id=?", (account.id,)
+        ).fetchone()
+        assert tuple(checkpoint) == (tx.id, 60.0)
+        # Tamper with history already covered by the checkpoint: only a deep check notices.
+        conn.execute("UPDATE transactions SET amount=90.0 WHERE id<?", (tx.id,))
+
+    assert service.reconcile_account(account.id)
+    assert not service.reconcile_account(account.id, deep=True)
+
+
+def test_reconcile_all_reports_drifted_accounts(tmp_path, monkeypatch):
+    db_path = tmp_path / "test.sqlite"
+    monkeypatch.setattr("src.data.db.get_db_path", lambda: db_path)
+    service = AccountService()
+    healthy = service.create_account(Account(id=None, name="Sana", owner="Alice", type="origen"))
+    drifted = service.create_account(Account(id=None, name="Descuadrada", owner="Bob", type="origen"))
+    service.apply_transaction(account_id=healthy.id, kind="deposit", amount=50.0)
+    service.apply_transaction(account_id=drifted.id, kind="deposit", amount=80.0)
+    service.apply_transaction(account_id=drifted.id, kind="incentive", amount=5.0)
+    assert service.reconcile_all()
+
+    with get_connection() as conn:
+        conn.execute("UPDATE accounts SET balance=balance+2.5 WHERE id=?", (drifted.id,))
+
+    report = service.reconcile_all()
+    assert not report
+    assert report.checked == 2
+    assert [entry.account_id for entry in report.discrepancies] == [drifted.id]
+    assert report.discrepancies[0].balance_drift == pytest.approx(2.5)
+    assert report.discrepancies[0].bonus_drift == pytest.approx(0.0)
+    assert not service.reconcile_all(deep=True)
+
+    with get_connection() as conn:
+        plan = " | ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + _RECONCILE_ALL, {"deep": False}))
+    # Transactions are only sought past each account's checkpoint, never scanned.
+    assert "SEARCH tx USING INDEX idx_tx_account_id (account_id=? AND id>?)" in plan
+    assert "SCAN tx" not in plan
@@ -0,0 +1,95 @@
+import pytest
+
+from src.data.db import get_connection
+from src.services.analytics_service import _SETTLEMENTS, AnalyticsService
+
+
+def prepare_history(services):
+    account_service, op_service = services
+    origin, hedge = account_service.list_accounts()
+    operations = []
+    for mode, source, outcome in [
+        ("calificacion", "efectivo", "GANA_A"),
+        ("credito_no_retorno", "credito", "GANA_B"),
+        ("calificacion", "efectivo", "ANULADA"),
+    ]:
+        operation = op_service.create_operation(
+            origin_account_id=origin.id,
+            hedge_account_id=hedge.id,
+            event="Partido",
+            mode=mode,
+            stake_source=source,
+            stake_a=25.0,
+            odds_a=2.0,
+            odds_b=2.1,
+            commission_b=5.0,
+        )
+        operations.append(op_service.settle_operation(operation.id, outcome))
+    # Pending operations are not part of the settled history.
+    op_service.create_operation(
+        origin_account_id=origin.id,
+        hedge_account_id=hedge.id,
+        event="Pendiente",
+        mode="calificacion",
+        stake_source="efectivo",
+        stake_a=10.0,
+        odds_a=2.0,
+        odds_b=2.1,
+        commission_b=5.0,
+    )
+    return operations, AnalyticsService().load()
+
+
+def test_realised_matches_expected_profit(services):
+    operations, analytics = prepare_history(services)
+
+    result = analytics.realised_vs_expected()
+
+    assert list(result.index) == [op.id for op in operations]
+    assert result.loc[operations[0].id, "expected"] == pytest.approx(operations[0].profit_a_wins)
+    assert result.loc[operations[1].id, "expected"] == pytest.approx(operations[1].profit_b_wins)
+    assert result.loc[operations[2].id, "realised"] == 0.0
+    assert result["difference"].abs().max() < 0.01
+
+
+def test_settlements_read_from_covering_index(services):
+    prepare_history(services)
+
+    with get_connection() as conn:
+        plan = " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + _SETTLEMENTS))
+    assert "COVERING INDEX idx_tx_settlements" in plan
+
+
+def test_profit_and_roi_by_dimension(services):
+    operations, analytics = prepare_history(services)
+    total = operations[0].profit_a_wins + operations[1].profit_b_wins
+
+    by_mode = analytics.profit_by("mode")
+    assert by_mode.loc["calificacion", "operations"] == 2
+    assert by_mode.loc["credito_no_retorno", "profit"] == pytest.approx(operations[1].profit_b_wins, abs=0.01)
+    by_source = analytics.profit_by("stake_source")
+    assert by_source.loc["efectivo", "profit"] == pytest.approx(operations[0].profit_a_wins, abs=0.01)
+    # Credit stakes lock no cash, so only the hedge exposure counts as capital.
+    assert by_source.loc["credito", "capital"] == pytest.approx(operations[1].exposure_b)
+    by_owner = analytics.profit_by("owner")
+    assert set(by_owner.index) == {"Alice", "Casa"}
+    assert by_owner["profit"].sum() == pytest.approx(total, abs=0.01)
+    assert by_owner.loc["Casa", "capital"] == pytest.approx(sum(op.exposure_b for op in operations))
+    by_account = analytics.profit_by("account")
+    assert list(by_account["operations"]) == [3, 3]
+    with pytest.raises(ValueError):
+        analytics.profit_by("event")
+
+
+def test_rolling_roi_and_drawdown(services):
+    operations, analytics = prepare_history(services)
+
+    rolling = analytics.rolling_roi(window=1)
+    assert rolling.iloc[0] == pytest.approx(
+        operations[0].profit_a_wins / (operations[0].stake_a + operations[0].exposure_b), abs=1e-3
+    )
+    assert rolling.iloc[2] == 0.0
+    drawdown = analytics.max_drawdown()
+    # The first operation loses the qualifying cost, the second wins it back.
+    assert drawdown.amount == pytest.approx(-operations[0].profit_a_wins, abs=0.01)
+    assert drawdown.trough is not None
@@ -1,4 +1,5 @@
-from pathlib import Path
+import json
+import sqlite3
 
 from src.data import backups, db
 
@@ -12,8 +13,42 @@ def test_backup_creation(tmp_path, monkeypatch):
     monkeypatch.setattr("src.data.db.get_db_path", fake_get_db_path)
     monkeypatch.setattr("src.data.backups.get_db_path", fake_get_db_path)
     db.initialise_database()
-    db_path.write_text("test")
+    with db.get_connection() as conn:
+        conn.execute("INSERT INTO accounts (name, owner, type) VALUES ('Respaldo', 'Alice', 'origen')")
 
-    monkeypatch.setattr("src.data.backups.BACKUP_DIR", tmp_path)
+    backup_dir = tmp_path / "backups"
+    backup_dir.mkdir()
+    monkeypatch.setattr("src.data.backups.BACKUP_DIR", backup_dir)
     backup_file = backups.create_backup()
     assert backup_file.exists()
+
+    restored = backups.restore_backup(backup_file, tmp_path / "restored.sqlite")
+    with sqlite3.connect(restored) as conn:
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        assert conn.execute("SELECT name FROM accounts").fetchone()[0] == "Respaldo"
+
+
+def test_backups_share_unchanged_chunks(tmp_path, monkeypatch):
+    db_path = tmp_path / "db.sqlite"
+    monkeypatch.setattr("src.data.db.get_db_path", lambda: db_path)
+    monkeypatch.setattr("src.data.backups.get_db_path", lambda: db_path)
+    monkeypatch.setattr("src.data.backups.BACKUP_DIR", tmp_path)
+    db.initialise_database()
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO accounts (name, owner, type, notes) VALUES (?, 'Alice', 'origen', ?)",
+            [(f"Cuenta {index}", "x" * 500) for index in range(1000)],
+        )
+
+    first = json.loads(backups.create_backup().read_text(encoding="utf-8"))
+    before = set((tmp_path / "chunks").glob("*/*.z"))
+    with db.get_connection() as conn:
+        conn.execute("UPDATE accounts SET notes = 'cambiada' WHERE name = 'Cuenta 500'")
+    second_path = backups.create_backup()
+    second = json.loads(second_path.read_text(encoding="utf-8"))
+
+    changed = {new for old, new in zip(first["chunks"], second["chunks"]) if old != new}
+    added = set((tmp_path / "chunks").glob("*/*.z")) - before
+    assert second_path.name != "betledger-" + first["created_at"] + ".json"
+    assert 0 < len(changed) <= 2 < len(second["chunks"])
+    assert {path.stem for path in added} == changed
@@ -1,8 +1,10 @@
 from decimal import Decimal
 
 import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
 
-from src.services.calculator_service import CalculatorService
+from src.services.calculator_service import CalculationInputs, CalculatorCache, CalculatorService
 
 
 @pytest.fixture
@@ -36,3 +38,83 @@ def test_invalid_inputs(service):
         service.compute(stake_a=0, odds_a=2.0, odds_b=2.0)
     with pytest.raises(ValueError):
         service.compute(stake_a=10, odds_a=1.0, odds_b=2.0)
+
+
+def test_invalid_inputs_fail_with_a_warm_cache(service):
+    service.compute(stake_a=10, odds_a=2.0, odds_b=2.1)
+    for _ in range(2):
+        with pytest.raises(TypeError):
+            service.compute(stake_a="10", odds_a=2.0, odds_b=2.1)
+        with pytest.raises(TypeError):
+            service.compute(stake_a=True, odds_a=2.0, odds_b=2.1)
+        with pytest.raises(ValueError):
+            service.compute(stake_a=-10, odds_a=2.0, odds_b=2.1)
+        with pytest.raises(ValueError):
+            service.compute(stake_a=10, odds_a=2.0, odds_b=2.1, mode="otro")
+
+
+def test_calculate_bundles_result_grid_and_ticks(service):
+    inputs = CalculationInputs(
+        stake_a=25.0, odds_a=2.03, odds_b=2.1, commission_b=4.0, mode="calificacion", stake_source="efectivo"
+    )
+
+    output = service.calculate(inputs, ticks=3, commissions=(0.0, 5.0))
+
+    assert output.result == service.compute(
+        stake_a=25.0, odds_a=2.03, odds_b=2.1, commission_b=4.0, mode="calificacion", stake_source="efectivo"
+    )
+    assert list(output.grid.odds_b) == [2.04, 2.06, 2.08, 2.1, 2.12, 2.14, 2.16]
+    assert list(output.grid.commissions) == [0.0, 4.0, 5.0]
+    assert output.grid.metric[3, 1] == pytest.approx(output.result.perdida_calificacion)
+    assert (output.odds_a_tick, output.odds_b_tick) == (Decimal("2.04"), Decimal("2.10"))
+    with pytest.raises(ValueError):
+        service.calculate(
+            CalculationInputs(
+                stake_a=-5.0, odds_a=2.0, odds_b=2.1, commission_b=5.0, mode="calificacion", stake_source="efectivo"
+            ),
+            ticks=3,
+            commissions=(5.0,),
+        )
+
+
+def test_cache_reuses_results_for_equivalent_inputs():
+    cache = CalculatorCache(maxsize=2)
+    service = CalculatorService(cache)
+
+    first = service.compute(stake_a=25, odds_a=2, odds_b=2.1)
+    again = service.compute(stake_a=25.0, odds_a=Decimal("2.00"), odds_b=2.1, stake_source="credito")
+    assert again is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    service.compute(stake_a=10.0, odds_a=2.0, odds_b=2.1)
+    service.compute(stake_a=11.0, odds_a=2.0, odds_b=2.1)
+    assert len(cache) == 2
+    assert service.compute(stake_a=25.0, odds_a=2.0, odds_b=2.1) == first
+    assert cache.misses == 4
+
+
+def test_disabled_cache_still_computes():
+    cache = CalculatorCache(maxsize=0)
+    service = CalculatorService(cache)
+    results = [service.compute(stake_a=25.0, odds_a=2.0, odds_b=2.1) for _ in range(2)]
+    assert results[0] == results[1] and results[0] is not results[1]
+    assert (len(cache), cache.hits, cache.misses) == (0, 0, 2)
+
+
+cents = st.integers(min_value=1, max_value=10_000_000).map(lambda value: value / 100)
+odds = st.integers(min_value=102, max_value=100_000).map(lambda value: value / 100)
+off_grid = st.floats(min_value=1.02, max_value=1000, allow_nan=False)
+
+
+@settings(max_examples=300, deadline=None)
+@given(
+    stake=cents | st.floats(min_value=0.01, max_value=100_000),
+    odds_a=odds | off_grid,
+    odds_b=odds | off_grid,
+    commission=st.integers(0, 1000).map(lambda value: value / 100),
+    mode=st.sampled_from(["calificacion", "credito_no_retorno"]),
+)
+def test_integer_core_matches_decimal(stake, odds_a, odds_b, commission, mode):
+    service = CalculatorService()
+    kwargs = dict(stake_a=stake, odds_a=odds_a, odds_b=odds_b, commission_b=commission, mode=mode)
+    assert service.compute(**kwargs) == service._compute_decimal(stake_source="efectivo", **kwargs)
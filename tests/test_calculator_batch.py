@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from src.services.calculator_service import CalculatorService
+
+MODES = ["calificacion", "credito_no_retorno"]
+
+cents = st.integers(min_value=1, max_value=500_000).map(lambda value: value / 100)
+odds = st.integers(min_value=102, max_value=100_000).map(lambda value: value / 100)
+commissions = st.sampled_from([0.0, 2.0, 2.5, 3.0, 5.0, 6.5, 10.0]) | st.integers(0, 1000).map(lambda v: v / 100)
+rows = st.lists(st.tuples(cents, odds, odds, commissions), min_size=1, max_size=40)
+
+
+def assert_matches_scalar(service, mode, stakes, odds_a, odds_b, commissions):
+    batch = service.compute_batch(
+        stake_a=stakes, odds_a=odds_a, odds_b=odds_b, commission_b=commissions, mode=mode
+    )
+    assert len(batch) == len(stakes)
+    for index in range(len(stakes)):
+        expected = service._compute_decimal(
+            stake_a=stakes[index],
+            odds_a=odds_a[index],
+            odds_b=odds_b[index],
+            commission_b=commissions[index],
+            mode=mode,
+            stake_source="efectivo",
+        )
+        assert batch.row(index) == expected, (stakes[index], odds_a[index], odds_b[index], commissions[index])
+
+
+@pytest.mark.parametrize("mode", MODES)
+@settings(max_examples=150, deadline=None)
+@given(rows=rows)
+def test_batch_matches_scalar(mode, rows):
+    assert_matches_scalar(CalculatorService(), mode, *map(list, zip(*rows)))
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_batch_matches_scalar_on_rounding_boundaries(mode):
+    # Small whole stakes and common commissions produce exact-cent exposures and
+    # half-cent ratings, where the Decimal path's intermediate rounding decides.
+    rng = np.random.default_rng(7)
+    size = 3000
+    stakes = rng.integers(1, 200, size).astype(float)
+    odds_a = rng.integers(102, 600, size) / 100
+    odds_b = rng.integers(102, 600, size) / 100
+    commissions = rng.choice([0.0, 2.0, 2.5, 5.0, 6.5, 10.0], size)
+    assert_matches_scalar(CalculatorService(), mode, stakes, odds_a, odds_b, commissions)
+
+
+def test_batch_handles_off_grid_inputs_and_broadcasting():
+    service = CalculatorService()
+    batch = service.compute_batch(stake_a=[10.123, 25.0], odds_a=2.0, odds_b=[2.105, 2.1], commission_b=5.0)
+    assert batch.row(0) == service.compute(stake_a=10.123, odds_a=2.0, odds_b=2.105)
+    assert batch.row(1) == service.compute(stake_a=25.0, odds_a=2.0, odds_b=2.1)
+    assert batch.beneficio_cnr is None and batch.perdida_calificacion is not None
+    # Products too large for exact int64 arithmetic also take the scalar path.
+    large = service.compute_batch(stake_a=1_000_000.0, odds_a=900.0, odds_b=950.0)
+    assert large.row(0) == service.compute(stake_a=1_000_000.0, odds_a=900.0, odds_b=950.0)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_batch_matches_scalar_at_extreme_odds(mode):
+    # Huge odds_a with a tiny stake keeps stake*odds_a*odds_b small while the
+    # rating numerator alone would overflow int64.
+    stakes = [0.01, 0.01, 1.0, 25.0]
+    odds_a = [1e9, 5e7, 1e6, 2.0]
+    odds_b = [2.1, 1.02, 3.0, 2.1]
+    assert_matches_scalar(CalculatorService(), mode, stakes, odds_a, odds_b, [5.0] * 4)
+
+
+def test_batch_rejects_invalid_rows():
+    service = CalculatorService()
+    with pytest.raises(ValueError, match="row 1"):
+        service.compute_batch(stake_a=[10.0, 0.0], odds_a=2.0, odds_b=2.1)
+    with pytest.raises(ValueError):
+        service.compute_batch(stake_a=10.0, odds_a=[2.0, 1.01], odds_b=2.1)
+    with pytest.raises(ValueError):
+        service.compute_batch(stake_a=10.0, odds_a=2.0, odds_b=2.1, commission_b=11.0)
+    with pytest.raises(ValueError):
+        service.compute_batch(stake_a=10.0, odds_a=2.0, odds_b=2.1, mode="otro")
+
+
+def test_sensitivity_grid_matches_point_calculations():
+    service = CalculatorService()
+    grid = service.sensitivity_grid(
+        stake_a=25.0, odds_a=2.0, odds_b_low=1.995, odds_b_high=2.1, commissions=[0.0, 5.0], mode="calificacion"
+    )
+    assert list(grid.odds_b) == [2.0, 2.02, 2.04, 2.06, 2.08, 2.1]
+    assert grid.metric.shape == grid.rating.shape == (6, 2)
+    assert grid.metric_name == "perdida_calificacion"
+    expected = service.compute(stake_a=25.0, odds_a=2.0, odds_b=2.06, commission_b=5.0)
+    assert grid.metric[3, 1] == expected.perdida_calificacion
+    assert grid.rating[3, 1] == expected.rating
+
+    cnr = service.sensitivity_grid(
+        stake_a=20.0, odds_a=5.0, odds_b_low=1.0, odds_b_high=1.03, commissions=[5.0], mode="credito_no_retorno"
+    )
+    # 1.01 itself is not a valid hedge price.
+    assert list(cnr.odds_b) == [1.02, 1.03]
+    assert cnr.metric[0, 0] == service.compute(
+        stake_a=20.0, odds_a=5.0, odds_b=1.02, mode="credito_no_retorno"
+    ).beneficio_cnr
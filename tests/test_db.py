@@ -0,0 +1,128 @@
+import sqlite3
+import threading
+
+import pytest
+
+from src.data import db
+
+
+def test_migrations_run_once_and_record_version(tmp_path, monkeypatch):
+    db_path = tmp_path / "db.sqlite"
+    monkeypatch.setattr("src.data.db.get_db_path", lambda: db_path)
+
+    db.initialise_database()
+    db.initialise_database()
+
+    with db.get_connection() as conn:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    assert version == db.MIGRATIONS[-1][0]
+    assert {"accounts", "operations", "transactions", "incentives"} <= tables
+
+
+def test_migrate_upgrades_unversioned_database(tmp_path):
+    db_path = tmp_path / "legacy.sqlite"
+    with sqlite3.connect(db_path) as legacy:
+        legacy.executescript(db.SCHEMA)
+        legacy.execute(
+            "INSERT INTO accounts (name, owner, type, balance) VALUES ('Legacy', 'Alice', 'origen', 10.0)"
+        )
+
+    with db.get_connection(db_path) as conn:
+        assert db.migrate(conn) == db.MIGRATIONS[-1][0]
+        assert conn.execute("SELECT name FROM accounts").fetchone()[0] == "Legacy"
+
+
+def test_migrate_refuses_open_transaction(tmp_path):
+    db_path = tmp_path / "pending.sqlite"
+    with db.get_connection(db_path) as conn:
+        db.migrate(conn)
+        conn.execute("INSERT INTO accounts (name, owner, type) VALUES ('Pendiente', 'Alice', 'origen')")
+        with pytest.raises(RuntimeError):
+            db.migrate(conn)
+        conn.rollback()
+        assert conn.execute("SELECT COUNT(*) FROM accounts").fetchone()[0] == 0
+
+
+def test_failing_after_commit_callback_does_not_skip_the_rest(tmp_path, caplog):
+    db_path = tmp_path / "callbacks.sqlite"
+    ran = []
+
+    def broken():
+        raise RuntimeError("listener bug")
+
+    with db.get_connection(db_path) as conn:
+        conn.execute("CREATE TABLE notes (body TEXT)")
+        conn.execute("INSERT INTO notes VALUES ('guardada')")
+        db.after_commit(broken)
+        db.after_commit(lambda: ran.append(True))
+
+    assert ran == [True]
+    assert "after-commit callback failed" in caplog.text
+    with db.get_connection(db_path) as conn:
+        assert conn.execute("SELECT body FROM notes").fetchone()[0] == "guardada"
+
+
+def test_pool_reuses_one_connection_per_thread(tmp_path):
+    db_path = tmp_path / "pool.sqlite"
+    with db.get_connection(db_path) as first:
+        with db.get_connection(db_path) as nested:
+            assert nested is first
+    with db.get_connection(db_path) as again:
+        assert again is first
+
+    other = []
+
+    def borrow():
+        with db.get_connection(db_path) as conn:
+            other.append(conn)
+
+    thread = threading.Thread(target=borrow)
+    thread.start()
+    thread.join()
+    assert other and other[0] is not first
+
+
+def test_pooled_connections_are_configured(tmp_path):
+    with db.get_connection(tmp_path / "pragmas.sqlite") as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        # 1 is NORMAL.
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+
+def test_nested_borrow_commits_only_with_the_outermost(tmp_path):
+    db_path = tmp_path / "nested.sqlite"
+    with db.get_connection(db_path) as conn:
+        conn.execute("CREATE TABLE notes (body TEXT)")
+
+    def committed():
+        with sqlite3.connect(db_path) as reader:
+            return [row[0] for row in reader.execute("SELECT body FROM notes")]
+
+    with db.transaction(db_path) as outer:
+        with db.get_connection(db_path) as inner:
+            inner.execute("INSERT INTO notes VALUES ('anidada')")
+        assert outer.in_transaction
+        assert committed() == []
+    assert committed() == ["anidada"]
+
+
+def test_exception_rolls_back_the_whole_borrow(tmp_path):
+    db_path = tmp_path / "rollback.sqlite"
+    ran = []
+    with db.get_connection(db_path) as conn:
+        conn.execute("CREATE TABLE notes (body TEXT)")
+
+    with pytest.raises(RuntimeError):
+        with db.transaction(db_path) as outer:
+            outer.execute("INSERT INTO notes VALUES ('exterior')")
+            with db.get_connection(db_path) as inner:
+                inner.execute("INSERT INTO notes VALUES ('interior')")
+                db.after_commit(lambda: ran.append(True))
+            raise RuntimeError("fallo")
+
+    with db.get_connection(db_path) as conn:
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0] == 0
+    assert ran == []
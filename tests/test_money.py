@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+from hypothesis import given
+from hypothesis import strategies as st
+
+from src.utils.money import Money, ceil_div, half_up_div, net_of_commission, odds_profit, scaled
+from src.utils.rounding import as_float, round_half_up, round_up, to_decimal
+
+amounts = st.integers(min_value=-10**9, max_value=10**9).map(lambda value: value / 100)
+any_floats = st.floats(min_value=-1e7, max_value=1e7, allow_nan=False)
+
+
+@given(value=amounts | any_floats)
+def test_scaled_agrees_with_decimal_str(value):
+    exact = scaled(value)
+    decimal_value = to_decimal(value) * 100
+    if exact is None:
+        assert decimal_value != decimal_value.to_integral_value()
+    else:
+        assert Decimal(exact) == decimal_value
+
+
+@given(value=amounts | any_floats, rounding=st.sampled_from(["half_up", "up"]))
+def test_money_rounds_like_decimal_helpers(value, rounding):
+    money = Money.from_value(value, rounding)
+    assert float(money) == as_float(value, rounding=rounding)
+    assert Decimal(str(money)) == (round_up(value) if rounding == "up" else round_half_up(value))
+
+
+@given(values=st.lists(amounts, max_size=50))
+def test_money_sums_exactly(values):
+    total = sum((Money.from_value(value) for value in values), Money(0))
+    assert Decimal(str(total)) == sum((to_decimal(value) for value in values), Decimal(0))
+
+
+@given(numerator=st.integers(-10**12, 10**12), denominator=st.integers(1, 10**6))
+def test_integer_division_matches_decimal_rounding(numerator, denominator):
+    exact = Decimal(numerator) / Decimal(denominator)
+    assert ceil_div(numerator, denominator) == exact.to_integral_value(rounding="ROUND_CEILING")
+    assert half_up_div(numerator, denominator) == exact.to_integral_value(rounding="ROUND_HALF_UP")
+
+
+@given(
+    stake=st.integers(1, 10**7).map(lambda value: value / 100),
+    odds=st.integers(101, 10**5).map(lambda value: value / 100),
+    commission=st.integers(0, 1000).map(lambda value: value / 100),
+)
+def test_settlement_amounts_are_exact(stake, odds, commission):
+    assert odds_profit(stake, odds) == float(to_decimal(stake) * (to_decimal(odds) - 1))
+    assert net_of_commission(stake, commission) == float(to_decimal(stake) * (1 - to_decimal(commission) / 100))
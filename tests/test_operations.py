@@ -1,38 +1,13 @@
 import pytest
 
+from src.data.db import get_connection
 from src.domain.models import Account
-from src.services.account_service import AccountService
-from src.services.operation_service import OperationService
+from src.services.operation_service import SORTABLE_COLUMNS, OperationService
+from src.utils.events import TRANSACTION_APPLIED, EventBus
 
 
-def setup_services(tmp_path, monkeypatch):
-    db_path = tmp_path / "test.sqlite"
-
-    def fake_get_db_path():
-        return db_path
-
-    monkeypatch.setattr("src.data.db.get_db_path", fake_get_db_path)
-    account_service = AccountService()
-    origin = account_service.create_account(
-        Account(id=None, name="Origen", owner="Alice", type="origen", balance=0.0)
-    )
-    hedge = account_service.create_account(
-        Account(
-            id=None,
-            name="Exchange",
-            owner="Casa",
-            type="contraposicion",
-            commission=5.0,
-            balance=0.0,
-        )
-    )
-    account_service.apply_transaction(account_id=origin.id, kind="deposit", amount=200.0)
-    account_service.apply_transaction(account_id=hedge.id, kind="deposit", amount=400.0)
-    return account_service, OperationService(account_service)
-
-
-def test_create_operation_locks_funds(tmp_path, monkeypatch):
-    account_service, op_service = setup_services(tmp_path, monkeypatch)
+def test_create_operation_locks_funds(services):
+    account_service, op_service = services
     origin, hedge = account_service.list_accounts()
     operation = op_service.create_operation(
         origin_account_id=origin.id,
@@ -52,8 +27,8 @@ def test_create_operation_locks_funds(tmp_path, monkeypatch):
     assert updated_hedge.balance < 400.0
 
 
-def test_cancel_operation_releases_funds(tmp_path, monkeypatch):
-    account_service, op_service = setup_services(tmp_path, monkeypatch)
+def test_cancel_operation_releases_funds(services):
+    account_service, op_service = services
     origin, hedge = account_service.list_accounts()
     operation = op_service.create_operation(
         origin_account_id=origin.id,
@@ -77,8 +52,8 @@ def test_cancel_operation_releases_funds(tmp_path, monkeypatch):
     assert updated_hedge.balance == pytest.approx(400.0)
 
 
-def test_list_operations_excludes_cancelled(tmp_path, monkeypatch):
-    account_service, op_service = setup_services(tmp_path, monkeypatch)
+def test_list_operations_excludes_cancelled(services):
+    account_service, op_service = services
     origin, hedge = account_service.list_accounts()
     first = op_service.create_operation(
         origin_account_id=origin.id,
@@ -108,3 +83,248 @@ def test_list_operations_excludes_cancelled(tmp_path, monkeypatch):
     remaining = op_service.list_operations(include_cancelled=False)
     assert all(op.status != "CANCELADA" for op in remaining)
     assert {op.id for op in remaining} == {second.id}
+
+
+def test_failed_update_rolls_back_every_leg(services):
+    account_service, op_service = services
+    origin, hedge = account_service.list_accounts()
+    empty_hedge = account_service.create_account(
+        Account(id=None, name="Exchange vacío", owner="Casa", type="contraposicion", balance=0.0)
+    )
+    operation = op_service.create_operation(
+        origin_account_id=origin.id,
+        hedge_account_id=hedge.id,
+        event="Partido",
+        mode="calificacion",
+        stake_source="efectivo",
+        stake_a=25.0,
+        odds_a=2.0,
+        odds_b=2.1,
+        commission_b=5.0,
+    )
+    before = {acc.id: acc.balance for acc in account_service.list_accounts()}
+
+    with pytest.raises(ValueError):
+        op_service.update_operation(
+            operation.id,
+            origin_account_id=origin.id,
+            hedge_account_id=empty_hedge.id,
+            event="Partido",
+            mode="calificacion",
+            stake_source="efectivo",
+            stake_a=25.0,
+            odds_a=2.0,
+            odds_b=2.1,
+            commission_b=5.0,
+        )
+
+    after = {acc.id: acc.balance for acc in account_service.list_accounts()}
+    assert after == before
+    assert op_service.get_operation(operation.id).hedge_account_id == hedge.id
+
+
+def test_bulk_creation_reports_row_errors(services):
+    account_service, op_service = services
+    origin, hedge = account_service.list_accounts()
+    base = {
+        "origin_account_id": origin.id,
+        "hedge_account_id": hedge.id,
+        "event": "Partido",
+        "mode": "calificacion",
+        "stake_source": "efectivo",
+        "odds_a": 2.0,
+        "odds_b": 2.1,
+        "commission_b": 5.0,
+    }
+    rows = [
+        base | {"stake_a": 25.0},
+        base | {"stake_a": 25.0, "odds_a": 1.0},
+        base | {"stake_a": 180.0},
+        base | {"stake_a": 10.0},
+    ]
+
+    bus = EventBus()
+    op_service = OperationService(account_service, bus=bus)
+    applied = []
+    bus.subscribe(TRANSACTION_APPLIED, applied.append)
+
+    result = op_service.create_operations_bulk(rows)
+
+    assert [index for index, _ in result.errors] == [1, 2]
+    assert len(result.created) == 2
+    assert {op.id for op in op_service.list_operations()} == {op.id for op in result.created}
+    updated_origin, updated_hedge = account_service.list_accounts()
+    assert updated_origin.balance == pytest.approx(200.0 - 35.0)
+    locked = sum(op.exposure_b for op in result.created)
+    assert updated_hedge.balance == pytest.approx(400.0 - locked)
+    assert account_service.reconcile_account(origin.id)
+    assert account_service.reconcile_account(hedge.id)
+    assert [(tx.kind, tx.ref_operation_id) for tx in applied] == [
+        ("op_lock", op.id) for op in result.created for _ in range(2)
+    ]
+    assert all(tx.id is not None for tx in applied)
+
+
+def test_bulk_creation_reports_non_finite_rows(services):
+    account_service, op_service = services
+    origin, hedge = account_service.list_accounts()
+    base = {
+        "origin_account_id": origin.id,
+        "hedge_account_id": hedge.id,
+        "event": "Partido",
+        "mode": "calificacion",
+        "stake_source": "efectivo",
+        "odds_a": 2.0,
+        "odds_b": 2.1,
+        "commission_b": 5.0,
+    }
+    rows = [
+        base | {"stake_a": 10.0},
+        base | {"stake_a": float("inf")},
+        base | {"stake_a": float("nan")},
+        base | {"stake_a": 10.0, "odds_b": float("inf")},
+        base | {"stake_a": 10.0},
+    ]
+
+    result = op_service.create_operations_bulk(rows)
+
+    assert [index for index, _ in result.errors] == [1, 2, 3]
+    assert len(result.created) == 2
+    assert account_service.list_accounts()[0].balance == pytest.approx(180.0)
+
+
+def test_bulk_creation_reports_non_numeric_rows(services):
+    account_service, op_service = services
+    origin, hedge = account_service.list_accounts()
+    base = {
+        "origin_account_id": origin.id,
+        "hedge_account_id": hedge.id,
+        "event": "Partido",
+        "mode": "calificacion",
+        "stake_source": "efectivo",
+        "odds_a": 2.0,
+        "odds_b": 2.1,
+        "commission_b": 5.0,
+    }
+    rows = [base | {"stake_a": 10.0}, base | {"stake_a": "10"}, base | {"stake_a": 10.0}]
+
+    result = op_service.create_operations_bulk(rows)
+
+    assert result.errors == [(1, "stake_a must be a number")]
+    assert len(result.created) == 2
+    assert account_service.list_accounts()[0].balance == pytest.approx(180.0)
+
+
+def test_query_operations_pages_with_keyset_cursor(services):
+    account_service, op_service = services
+    origin, hedge = account_service.list_accounts()
+    created = [
+        op_service.create_operation(
+            origin_account_id=origin.id,
+            hedge_account_id=hedge.id,
+            event=f"Partido {index}",
+            mode="calificacion",
+            stake_source="efectivo",
+            stake_a=5.0,
+            odds_a=2.0,
+            odds_b=2.1,
+            commission_b=5.0,
+        )
+        for index in range(5)
+    ]
+    op_service.cancel_operation(created[1].id)
+
+    seen = []
+    cursor = None
+    while True:
+        page = op_service.query_operations(include_cancelled=False, limit=2, after=cursor)
+        seen.extend(op.id for op in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == [op.id for op in reversed(created) if op.id != created[1].id]
+
+    cancelled = op_service.query_operations(status="CANCELADA", account_id=hedge.id)
+    assert [op.id for op in cancelled.items] == [created[1].id]
+    assert op_service.query_operations(event="Partido 3").items[0].id == created[3].id
+
+
+def test_account_filter_pages_without_sorting(services):
+    account_service, op_service = services
+    origin, hedge = account_service.list_accounts()
+    other = account_service.create_account(
+        Account(id=None, name="Otra", owner="Bob", type="origen", balance=0.0)
+    )
+    account_service.apply_transaction(account_id=other.id, kind="deposit", amount=100.0)
+    created = [
+        op_service.create_operation(
+            origin_account_id=source.id,
+            hedge_account_id=hedge.id,
+            event=f"Partido {index}",
+            mode="calificacion",
+            stake_source="efectivo",
+            stake_a=5.0,
+            odds_a=2.0,
+            odds_b=2.1,
+            commission_b=5.0,
+        )
+        for index, source in enumerate([origin, other, origin, other])
+    ]
+
+    statements = []
+    with get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            first = op_service.query_operations(account_id=hedge.id, limit=3)
+            rest = op_service.query_operations(account_id=hedge.id, limit=3, after=first.next_cursor)
+        finally:
+            conn.set_trace_callback(None)
+        plans = [
+            " | ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+            for sql in statements
+            if sql.lstrip().startswith("SELECT")
+        ]
+
+    assert [op.id for op in first.items + rest.items] == [op.id for op in reversed(created)]
+    assert [op.id for op in op_service.query_operations(account_id=other.id).items] == [created[3].id, created[1].id]
+    assert len(plans) == 2
+    for plan in plans:
+        assert "idx_ops_account_ts" in plan and "idx_ops_hedge_ts" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_query_operations_sorts_in_sql(services):
+    account_service, op_service = services
+    origin, hedge = account_service.list_accounts()
+    for stake in (7.0, 3.0, 9.0, 5.0):
+        op_service.create_operation(
+            origin_account_id=origin.id,
+            hedge_account_id=hedge.id,
+            event="Partido",
+            mode="calificacion",
+            stake_source="efectivo",
+            stake_a=stake,
+            odds_a=2.0,
+            odds_b=2.1,
+            commission_b=5.0,
+        )
+
+    first = op_service.query_operations(order_by="stake_a", descending=False, limit=3)
+    rest = op_service.query_operations(order_by="stake_a", descending=False, limit=3, after=first.next_cursor)
+    assert [op.stake_a for op in first.items + rest.items] == [3.0, 5.0, 7.0, 9.0]
+    with pytest.raises(ValueError):
+        op_service.query_operations(order_by="notes; DROP TABLE operations")
+
+
+def test_sortable_columns_page_from_an_index(services):
+    with get_connection() as conn:
+        for column in SORTABLE_COLUMNS:
+            plan = " | ".join(
+                row[3]
+                for row in conn.execute(
+                    f"EXPLAIN QUERY PLAN SELECT * FROM operations WHERE ({column}, id) < (?, ?) "
+                    f"ORDER BY {column} DESC, id DESC LIMIT 10",
+                    ("x", 1),
+                )
+            )
+            assert "TEMP B-TREE" not in plan, column
@@ -0,0 +1,59 @@
+import pytest
+
+from src.services.calculator_service import CalculatorService
+from src.services.price_compare_service import PriceCompareService
+
+FEED = """provider_a,provider_b,mercado,seleccion,odds_a,odds_b,commission_b,rating,extra
+Casa1,Exchange,1X2,1,2.0,2.1,,,x
+Casa2,Exchange,1X2,X,3.4,3.5,2.0,12.5,y
+Casa1,Exchange,1X2,2,4.1,4.3,5.0,,z
+"""
+
+
+def test_from_csv_fills_defaults_and_ranks_by_computed_rating(tmp_path):
+    path = tmp_path / "feed.csv"
+    path.write_text(FEED, encoding="utf-8")
+
+    opportunities = PriceCompareService(reference_stake=20.0).from_csv(path)
+
+    ratings = [opportunity.rating for opportunity in opportunities]
+    assert ratings == sorted(ratings, reverse=True)
+    by_selection = {opportunity.seleccion: opportunity for opportunity in opportunities}
+    first, second = by_selection["1"], by_selection["X"]
+    assert (first.provider_a, first.odds_b, first.commission_b) == ("Casa1", 2.1, 5.0)
+    calculator = CalculatorService()
+    qualifying = calculator.compute(stake_a=20.0, odds_a=3.4, odds_b=3.5, commission_b=2.0)
+    cnr = calculator.compute(stake_a=20.0, odds_a=3.4, odds_b=3.5, commission_b=2.0, mode="credito_no_retorno")
+    assert second.rating == qualifying.rating != 12.5
+    assert second.perdida_calificacion == qualifying.perdida_calificacion
+    assert (second.beneficio_cnr, second.rendimiento_cnr) == (cnr.beneficio_cnr, cnr.rendimiento_cnr)
+
+
+def test_invalid_rows_keep_feed_values():
+    (opportunity,) = PriceCompareService().from_http_json(
+        '[{"provider_a": "A", "provider_b": "B", "mercado": "M", "seleccion": "S",'
+        ' "odds_a": 1.01, "odds_b": 2.0, "rating": 55.0}]'
+    )
+    assert (opportunity.rating, opportunity.perdida_calificacion) == (55.0, 0.0)
+
+
+def test_iter_csv_streams_batches(tmp_path):
+    path = tmp_path / "feed.csv"
+    path.write_text(FEED, encoding="utf-8")
+
+    batches = list(PriceCompareService().iter_csv(path, chunksize=2))
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert batches[1][0].odds_a == 4.1
+    assert batches[0][0].rating >= batches[0][1].rating
+
+
+def test_from_http_json_and_missing_columns():
+    service = PriceCompareService()
+    (opportunity,) = service.from_http_json(
+        '[{"provider_a": "A", "provider_b": "B", "mercado": "M", "seleccion": "S", "odds_a": "2.5", "odds_b": 2.6}]'
+    )
+    assert (opportunity.odds_a, opportunity.commission_b) == (2.5, 5.0)
+    assert service.from_http_json("[]") == []
+    with pytest.raises(ValueError, match="odds_b"):
+        service.from_http_json('[{"provider_a": "A", "provider_b": "B", "mercado": "M", "seleccion": "S", "odds_a": 2}]')
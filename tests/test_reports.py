@@ -0,0 +1,230 @@
+from datetime import UTC, date, datetime
+
+import pytest
+
+from src.data.db import get_connection
+from src.data.rollups import rebuild_rollups
+from src.domain.models import Account
+from src.services.account_service import AccountService
+from src.services.report_cache import ReportCache
+from src.services.operation_service import OperationService
+from src.services.report_service import _PENDING_BY_EVENT, ReportService
+
+
+def prepare_settlements(tmp_path, monkeypatch):
+    db_path = tmp_path / "test.sqlite"
+
+    def fake_get_db_path():
+        return db_path
+
+    monkeypatch.setattr("src.data.db.get_db_path", fake_get_db_path)
+    account_service = AccountService()
+    account = account_service.create_account(
+        Account(id=None, name="Origen", owner="Alice", type="origen", balance=0.0)
+    )
+    for ts, amount in [
+        (datetime(2024, 12, 30, 10, tzinfo=UTC), 10.0),
+        (datetime(2024, 12, 31, 23, tzinfo=UTC), -4.0),
+        (datetime(2025, 1, 2, 8, tzinfo=UTC), 6.5),
+        (datetime(2025, 2, 3, 8, tzinfo=UTC), 1.5),
+    ]:
+        account_service.apply_transaction(account_id=account.id, kind="op_settlement", amount=amount, ts=ts)
+    account_service.apply_transaction(account_id=account.id, kind="deposit", amount=100.0)
+    return account_service, ReportService()
+
+
+def test_profit_over_time_buckets(tmp_path, monkeypatch):
+    _, reports = prepare_settlements(tmp_path, monkeypatch)
+
+    assert reports.profit_over_time("day") == [
+        ("2024-12-30", 10.0),
+        ("2024-12-31", -4.0),
+        ("2025-01-02", 6.5),
+        ("2025-02-03", 1.5),
+    ]
+    assert reports.profit_over_time("week") == [("2025-W01", 12.5), ("2025-W06", 1.5)]
+    assert reports.profit_over_time("month") == [("2024-12", 6.0), ("2025-01", 6.5), ("2025-02", 1.5)]
+    with pytest.raises(ValueError):
+        reports.profit_over_time("year")
+
+
+def test_profit_over_time_bounds(tmp_path, monkeypatch):
+    _, reports = prepare_settlements(tmp_path, monkeypatch)
+
+    assert reports.profit_over_time("month", start=date(2024, 12, 31), end=date(2025, 2, 1)) == [
+        ("2024-12", -4.0),
+        ("2025-01", 6.5),
+    ]
+
+
+def test_kpis_are_exact_cents(tmp_path, monkeypatch):
+    db_path = tmp_path / "test.sqlite"
+    monkeypatch.setattr("src.data.db.get_db_path", lambda: db_path)
+    account_service = AccountService()
+    account = account_service.create_account(
+        Account(id=None, name="Origen", owner="Alice", type="origen", balance=0.0)
+    )
+    for amount in (0.1, 0.2):
+        account_service.apply_transaction(account_id=account.id, kind="op_settlement", amount=amount)
+
+    kpis = ReportService().kpis()
+
+    # Summed as floats these would be 0.30000000000000004.
+    assert kpis["beneficio_total"] == 0.3
+    assert kpis["saldo_total"] == 0.3
+
+
+def test_rollups_follow_writes_and_rebuild(tmp_path, monkeypatch):
+    _, reports = prepare_settlements(tmp_path, monkeypatch)
+    assert reports.kpis()["beneficio_total"] == pytest.approx(14.0)
+
+    with get_connection() as conn:
+        conn.execute("DELETE FROM transactions WHERE amount = -4.0")
+        conn.execute("UPDATE transactions SET amount = 2.5 WHERE amount = 1.5")
+        maintained = sorted(map(tuple, conn.execute("SELECT * FROM rollup_tx_daily")))
+    assert reports.kpis()["beneficio_total"] == pytest.approx(19.0)
+
+    with get_connection() as conn:
+        conn.execute("DELETE FROM rollup_tx_daily")
+    rebuild_rollups()
+    with get_connection() as conn:
+        assert sorted(map(tuple, conn.execute("SELECT * FROM rollup_tx_daily"))) == maintained
+
+
+def test_rollups_survive_editing_an_operation_mode(tmp_path, monkeypatch):
+    account_service, _ = prepare_settlements(tmp_path, monkeypatch)
+    origin = account_service.list_accounts()[0]
+    hedge = account_service.create_account(
+        Account(id=None, name="Exchange", owner="Casa", type="contraposicion", commission=5.0, balance=0.0)
+    )
+    account_service.apply_transaction(account_id=hedge.id, kind="deposit", amount=100.0)
+    op_service = OperationService(account_service)
+    legs = dict(origin_account_id=origin.id, hedge_account_id=hedge.id, event="Partido", stake_source="efectivo")
+    prices = dict(stake_a=10.0, odds_a=2.0, odds_b=2.1, commission_b=5.0)
+    operation = op_service.create_operation(mode="calificacion", **legs, **prices)
+    op_service.update_operation(operation.id, mode="credito_no_retorno", **legs, **prices)
+    op_service.settle_operation(operation.id, "GANA_B")
+
+    def snapshot():
+        with get_connection() as conn:
+            return [
+                sorted(map(tuple, conn.execute(f"SELECT * FROM {table}")))
+                for table in ("rollup_tx_daily", "rollup_ops_daily")
+            ]
+
+    maintained = snapshot()
+    rebuild_rollups()
+    assert snapshot() == maintained
+
+
+def test_report_cache_evicts_only_affected_entries(tmp_path, monkeypatch):
+    account_service, reports = prepare_settlements(tmp_path, monkeypatch)
+    cache = ReportCache(reports, bus=account_service.bus)
+    calls = []
+    original = reports.profit_over_time
+
+    def counting_profit_over_time(*args, **kwargs):
+        calls.append(kwargs.get("start"))
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(reports, "profit_over_time", counting_profit_over_time)
+    january = cache.profit_over_time("month", start=date(2025, 1, 1), end=date(2025, 2, 1))
+    cache.profit_over_time("month", start=date(2025, 1, 1), end=date(2025, 2, 1))
+    cache.profit_over_time("month")
+    assert len(calls) == 2
+    assert cache.kpis()["beneficio_total"] == pytest.approx(14.0)
+
+    origin = account_service.list_accounts()[0]
+    account_service.apply_transaction(
+        account_id=origin.id, kind="op_settlement", amount=3.0, ts=datetime(2025, 3, 1, tzinfo=UTC)
+    )
+
+    assert cache.profit_over_time("month", start=date(2025, 1, 1), end=date(2025, 2, 1)) == january
+    assert cache.profit_over_time("month")[-1] == ("2025-03", 3.0)
+    assert len(calls) == 3
+    assert cache.kpis()["beneficio_total"] == pytest.approx(17.0)
+
+    cache.close()
+    account_service.apply_transaction(account_id=origin.id, kind="op_settlement", amount=1.0)
+    assert cache.kpis()["beneficio_total"] == pytest.approx(18.0)
+    account_service.apply_transaction(account_id=origin.id, kind="op_settlement", amount=1.0)
+    # Closed caches no longer hear about new transactions.
+    assert cache.kpis()["beneficio_total"] == pytest.approx(18.0)
+
+
+def test_cumulative_profit_is_downsampled(tmp_path, monkeypatch):
+    account_service, reports = prepare_settlements(tmp_path, monkeypatch)
+
+    assert reports.cumulative_profit(10) == [
+        ("2024-12-30", 10.0),
+        ("2024-12-31", 6.0),
+        ("2025-01-02", 12.5),
+        ("2025-02-03", 14.0),
+    ]
+    # The final total is always kept, along with the trough the chart must not hide.
+    assert reports.cumulative_profit(3) == [("2024-12-30", 10.0), ("2024-12-31", 6.0), ("2025-02-03", 14.0)]
+    assert reports.cumulative_profit(10, start=date(2025, 1, 1)) == [("2025-01-02", 6.5), ("2025-02-03", 8.0)]
+
+
+def test_pending_risk_report(tmp_path, monkeypatch):
+    account_service, reports = prepare_settlements(tmp_path, monkeypatch)
+    origin = account_service.list_accounts()[0]
+    hedge = account_service.create_account(
+        Account(id=None, name="Exchange", owner="Casa", type="contraposicion", commission=5.0, balance=0.0)
+    )
+    account_service.apply_transaction(account_id=hedge.id, kind="deposit", amount=400.0)
+    op_service = OperationService(account_service)
+    created = []
+    for event, source in [("Final", "efectivo"), ("Final", "credito"), ("Semifinal", "efectivo")]:
+        created.append(
+            op_service.create_operation(
+                origin_account_id=origin.id,
+                hedge_account_id=hedge.id,
+                event=event,
+                mode="calificacion",
+                stake_source=source,
+                stake_a=20.0,
+                odds_a=2.0,
+                odds_b=2.1,
+                commission_b=5.0,
+            )
+        )
+    op_service.settle_operation(created[2].id, "GANA_A")
+
+    report = reports.pending_risk()
+
+    (final,) = report.by_event
+    assert final.key == "Final" and final.operations == 2
+    assert final.locked_stake == pytest.approx(20.0)
+    assert final.exposure == pytest.approx(created[0].exposure_b + created[1].exposure_b)
+    assert final.worst_case == pytest.approx(
+        min(created[0].profit_a_wins + created[1].profit_a_wins, created[0].profit_b_wins + created[1].profit_b_wins)
+    )
+    assert [(line.account_id, line.name, line.locked_stake) for line in report.by_account] == [
+        (hedge.id, "Exchange", 0.0),
+        (origin.id, "Origen", 20.0),
+    ]
+    assert [line.key for line in report.by_owner] == ["Alice", "Casa"]
+    assert report.total_locked == pytest.approx(20.0 + final.exposure)
+
+    with get_connection() as conn:
+        plan = " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + _PENDING_BY_EVENT))
+    assert "COVERING INDEX idx_ops_pending" in plan
+
+
+def test_profit_series_matches_single_period_reports(tmp_path, monkeypatch):
+    account_service, reports = prepare_settlements(tmp_path, monkeypatch)
+    other = account_service.create_account(Account(id=None, name="Otra", owner="Bob", type="origen", balance=0.0))
+    account_service.apply_transaction(
+        account_id=other.id, kind="op_settlement", amount=2.0, ts=datetime(2025, 1, 3, tzinfo=UTC)
+    )
+
+    series = reports.profit_series(by_account=True, start=date(2024, 12, 31))
+
+    for period in ("day", "week", "month"):
+        assert series.totals[period] == reports.profit_over_time(period, start=date(2024, 12, 31))
+    assert series.totals["week"] == [("2025-W01", 4.5), ("2025-W06", 1.5)]
+    assert series.by_account["month"][other.id] == [("2025-01", 2.0)]
+    assert reports.profit_series(("month",)).by_account == {}
+    with pytest.raises(ValueError):
+        reports.profit_series(("day", "year"))
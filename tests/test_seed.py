@@ -0,0 +1,25 @@
+from src.data import seed
+from src.data.db import get_connection
+from src.domain.models import Account
+from src.services.account_service import AccountService
+
+
+def test_reseed_after_reconcile(tmp_path, monkeypatch):
+    db_path = tmp_path / "seed.sqlite"
+    monkeypatch.setattr("src.data.db.get_db_path", lambda: db_path)
+    account_service = AccountService()
+    account = account_service.create_account(
+        Account(id=None, name="Propia", owner="Alice", type="origen", balance=0.0)
+    )
+    account_service.apply_transaction(account_id=account.id, kind="deposit", amount=50.0)
+    assert account_service.reconcile_account(account.id)
+    with get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM balance_checkpoints").fetchone()[0] == 1
+
+    seed.run()
+
+    assert [account.name for account in account_service.list_accounts()] == [
+        "Cuenta Origen A",
+        "Cuenta Origen B",
+        "Exchange X",
+    ]
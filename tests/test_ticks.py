@@ -0,0 +1,65 @@
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.utils.ticks import TickLadder, TickSizeBand, get_ladder, register_ladder
+
+
+def test_default_ladder_covers_every_price_once():
+    ladder = get_ladder()
+    assert ladder.min_price == Decimal("1.01") and ladder.max_price == Decimal("100.0")
+    assert ladder.prices == sorted(set(ladder.prices))
+    assert str(ladder.snap_up(2.0)) == "2.00"
+    assert str(ladder.snap_up(4.01)) == "4.1"
+
+
+def test_lookups():
+    ladder = get_ladder()
+    assert ladder.snap_up(2.03) == Decimal("2.04")
+    assert ladder.snap_down(2.03) == Decimal("2.02")
+    assert ladder.snap_up(2.04) == ladder.snap_down(2.04) == Decimal("2.04")
+    assert ladder.next_tick(2.04) == Decimal("2.06")
+    assert ladder.previous_tick(2.04) == Decimal("2.02")
+    assert ladder.next_tick(Decimal("3.00")) == Decimal("3.05")
+    assert ladder.snap_up(1.0) == Decimal("1.01")
+    with pytest.raises(ValueError):
+        ladder.next_tick(100.0)
+    with pytest.raises(ValueError):
+        ladder.previous_tick(1.01)
+
+
+def test_snap_array_matches_scalar_lookups():
+    ladder = get_ladder()
+    odds = np.array([1.5, 2.03, 7.1, 99.0, 150.0, 0.5, np.nan])
+    up = ladder.snap_array(odds)
+    down = ladder.snap_array(odds, "down")
+    for index, value in enumerate(odds[:4]):
+        assert up[index] == float(ladder.snap_up(float(value)))
+        assert down[index] == float(ladder.snap_down(float(value)))
+    assert np.isnan(up[4]) and np.isnan(down[5]) and np.isnan(up[6])
+    assert up[5] == 1.01
+
+
+def test_custom_ladder_registration():
+    ladder = register_ladder(
+        "decimal-0.05",
+        [
+            TickSizeBand(Decimal("1.05"), Decimal("2.0"), Decimal("0.05")),
+            TickSizeBand(Decimal("2.0"), Decimal("5.0"), Decimal("0.25")),
+        ],
+    )
+    assert get_ladder("decimal-0.05") is ladder
+    assert ladder.snap_up(1.97) == Decimal("2.00")
+    assert ladder.next_tick(2.0) == Decimal("2.25")
+    assert isinstance(register_ladder("copy", ladder), TickLadder)
+    with pytest.raises(KeyError):
+        get_ladder("missing")
+
+
+def test_ranges_and_shifts():
+    ladder = get_ladder()
+    assert ladder.between(1.995, 2.06) == [Decimal("2.00"), Decimal("2.02"), Decimal("2.04"), Decimal("2.06")]
+    assert ladder.shift(2.03, -2) == Decimal("2.00")
+    assert ladder.shift(2.03, 1) == Decimal("2.06")
+    assert ladder.shift(1.01, -5) == Decimal("1.01")